@@ -1,42 +1,46 @@
+from __future__ import annotations
+
 import os
 import sys
 import threading
 from time import sleep
+from typing import TYPE_CHECKING
 
-import pythoncom
 import typer
 from loguru import logger
 
-from super_ctf.gui.time import Countdown
-from super_ctf.persistency.mutex import MutexByName
-from super_ctf.persistency.service import TestService
-from super_ctf.persistency.task import TASK_NAME, create_task, delete_task
-from super_ctf.watcher import Status, check_watch
+# Keep module-level imports light: `--help`, `clean` and `import-time` must
+# not pay for tkinter, the GUI or pywin32. Heavy modules are imported inside
+# the commands that need them (see `python src/main.py import-time`).
+from super_ctf.persistency.backend import MUTEX_NAME, get_backend
+from super_ctf.persistency.task import FILE_TO_RUN, TASK_NAME
 
-DONE = 2
+if TYPE_CHECKING:
+    from super_ctf.gui.time import Countdown
+    from super_ctf.watcher import Status
 
 
 def prepare_resources() -> None:
+    backend = get_backend()
     try:
-        create_task(TASK_NAME)
+        backend.tasks.create_task(TASK_NAME, FILE_TO_RUN)
     except Exception as e:
         logger.exception("Failed to create scheduled task: %s", e)
 
     try:
         # calling install_service won't do anything harmful in non-admin
         # contexts; we call get_service_info() to ensure service object exists
-        TestService.stop_service()
-        TestService.remove_service()
+        backend.service.stop_service()
+        backend.service.remove_service()
         sleep(1)
-        TestService.install_service()
-        TestService.set_start_manual()
-        TestService.run_service()
+        backend.service.install_service()
+        backend.service.set_start_type("manual")
+        backend.service.run_service()
     except Exception:
         logger.exception("Could not (re)install service")
 
 
 def check_status(status: Status):
-    print(status)
     completed_missions = 0
     if (
         not status.service_exists
@@ -51,17 +55,28 @@ def check_status(status: Status):
 
 
 def update_display(app: Countdown):
-    pythoncom.CoInitialize()
-    for status in check_watch(task_name=TASK_NAME):
-        sleep(3)
-        result = check_status(status)
-        if result == DONE:
-            app.timer_label.destroy()
-            app.conffeti.start()
-            sleep(3)
-        else:
-            app.missions_compelete = result
-    pythoncom.CoUninitialize()
+    from super_ctf.diff import StatusDiffer, deltas  # noqa: PLC0415
+    from super_ctf.watcher import watch_statuses  # noqa: PLC0415
+
+    # The probes run on their own COM-initialised workers (super_ctf.probes).
+    # Runs off the Tk thread, so it only posts to the countdown's channel.
+    # The differ drops unchanged snapshots, except the one after a resync.
+    differ = StatusDiffer()
+    app.on_resync = differ.request_snapshot
+    for delta in deltas(watch_statuses(task_name=TASK_NAME), differ):
+        logger.info(f"Status: {delta}")
+        app.channel.post(delta)
+
+
+def watch_in_tk(app: Countdown) -> None:
+    """Drive the watcher from `app`'s Tk loop instead of a thread."""
+    from super_ctf.gui.watch import TkWatcher  # noqa: PLC0415
+
+    def on_status(status: Status) -> None:
+        logger.info(f"Status: {status}")
+        app.channel.post(status)
+
+    TkWatcher(app.window, on_status, task_name=TASK_NAME).start()
 
 
 def is_admin() -> bool:
@@ -82,11 +97,16 @@ def is_admin() -> bool:
         return os.geteuid() == 0 if hasattr(os, "geteuid") else False
 
 
-def run_app() -> None:
+def run_app(tk_watcher: bool = False) -> None:
     """Start the application normally (same behavior as running the script
     with no arguments).
+
+    With `tk_watcher`, the watcher is stepped from the Tk event loop instead
+    of running on its own thread.
     """
-    mutex = MutexByName()
+    from super_ctf.gui.time import Countdown  # noqa: PLC0415
+
+    mutex = get_backend().mutex(MUTEX_NAME)
     mutex.create()
 
     if not is_admin():
@@ -97,9 +117,12 @@ def run_app() -> None:
 
     prepare_resources()
 
-    countdown = Countdown(3 * 60)
+    countdown = Countdown(3 * 60, score=check_status)
     # countdown = Countdown(5)
-    threading.Thread(target=update_display, args=(countdown,), daemon=True).start()
+    if tk_watcher:
+        watch_in_tk(countdown)
+    else:
+        threading.Thread(target=update_display, args=(countdown,), daemon=True).start()
     countdown.start()
     countdown.window.mainloop()
 
@@ -108,10 +131,21 @@ app = typer.Typer(invoke_without_command=True)
 
 
 @app.callback(invoke_without_command=True)
-def _cli(ctx: typer.Context) -> None:
+def _cli(
+    ctx: typer.Context,
+    tk_watcher: bool = typer.Option(
+        False, help="Run the watcher in the Tk event loop, without a thread."
+    ),
+    debug: bool = typer.Option(True, "--debug/--no-debug", help="Log DEBUG messages."),
+) -> None:
+    from super_ctf.logs import setup_logging  # noqa: PLC0415
+
+    # one enqueued sink, so polling threads never block on writing logs
+    ctx.obj = "DEBUG" if debug else "INFO"
+    setup_logging(ctx.obj)
     # If no subcommand was invoked, run the app normally
     if ctx.invoked_subcommand is None:
-        run_app()
+        run_app(tk_watcher)
 
 
 @app.command()
@@ -119,8 +153,9 @@ def clean() -> None:
     """Delete the scheduled task and the service (best-effort)."""
     # Delete scheduled task
     print("Cleaning up resources...")
+    backend = get_backend()
     try:
-        deleted = delete_task(TASK_NAME)
+        deleted = backend.tasks.delete_task(TASK_NAME)
         logger.info(f"Deleted scheduled task: {deleted}")
     except Exception as e:
         typer.echo(f"Failed to delete scheduled task: {e}")
@@ -128,16 +163,74 @@ def clean() -> None:
     # Remove service
     try:
         logger.info("Requested service removal")
-        info = TestService.get_service_info()
+        info = backend.service.get_service_info()
         logger.warning(info)
-        TestService.stop_service()
-        TestService.remove_service()
-        info = TestService.get_service_info()
+        backend.service.stop_service()
+        backend.service.remove_service()
+        info = backend.service.get_service_info()
         logger.warning(info)
     except Exception as e:
         logger.info(f"Failed to remove service: {e}")
 
 
+@app.command("import-time")
+def import_time(
+    budget_ms: float = typer.Option(
+        None,
+        help="Fail if any command's super_ctf imports take longer than this"
+        " (default: per-command baseline).",
+    ),
+    runs: int = typer.Option(3, help="Runs per command; the fastest one is reported."),
+) -> None:
+    """Measure cold-start import time per subcommand and guard against regressions."""
+    from super_ctf.bench.import_time import check_commands  # noqa: PLC0415
+
+    if not check_commands(__file__, budget_ms=budget_ms, runs=runs):
+        raise typer.Exit(1)
+
+
+@app.command("bench-animations")
+def bench_animations(
+    frames: int = typer.Option(300, help="Frames to run per scenario."),
+    rasterize: bool = typer.Option(
+        False, help="Also rasterise every frame (needs Pillow)."
+    ),
+    cpu_scale: float = typer.Option(
+        1.0, help="Scale the CPU budgets (with and without Tcl), for slower machines."
+    ),
+) -> None:
+    """Measure per-frame CPU time and Tcl calls and commands of the animations."""
+    from super_ctf.bench.animations import check_animations  # noqa: PLC0415
+
+    if not check_animations(frames, rasterize=rasterize, cpu_scale=cpu_scale):
+        raise typer.Exit(1)
+
+
+@app.command("bench-logging")
+def bench_logging(
+    ctx: typer.Context,
+    polls: int = typer.Option(20_000, help="Polls to replay per scenario."),
+    scale: float = typer.Option(1.0, help="Scale the budgets, for slower machines."),
+) -> None:
+    """Measure the per-poll cost of the watcher's debug logging."""
+    from super_ctf.bench.logging_cost import check_logging  # noqa: PLC0415
+
+    if not check_logging(polls, scale=scale, log_level=ctx.obj or "DEBUG"):
+        raise typer.Exit(1)
+
+
+@app.command("bench-targets")
+def bench_targets(
+    cycles: int = typer.Option(100, help="Cycles to run per target count."),
+    scale: float = typer.Option(1.0, help="Scale the budgets, for slower machines."),
+) -> None:
+    """Measure the cycle cost of watching many targets, with a fake backend."""
+    from super_ctf.bench.targets import check_targets  # noqa: PLC0415
+
+    if not check_targets(cycles, scale=scale):
+        raise typer.Exit(1)
+
+
 if __name__ == "__main__":
     app()
 # mutex = MutexByName()
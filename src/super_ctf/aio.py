@@ -0,0 +1,183 @@
+"""asyncio adapter for the watcher.
+
+Usage:
+    async for status in watch_async():
+        ...
+
+Each blocking probe call is submitted on its own to an executor shared by
+the whole process (see `super_ctf.probes.ProbeBatch`) and awaited with a
+timeout, so many watchers can share one event loop and one small thread
+pool instead of needing OS threads each.
+
+A background producer task probes at the pace chosen by an
+`AdaptivePoller` and stores each snapshot in a single-slot `Latest`
+mailbox. A slow consumer never builds up a backlog: it always receives the
+newest snapshot, and older unread ones are dropped. Breaking out of the
+loop, closing the iterator or cancelling the consuming task stops the
+producer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING, Any
+
+from super_ctf.pacing import AdaptivePoller
+from super_ctf.persistency.task import TASK_NAME
+from super_ctf.watcher import Status, default_probe_batch
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+    from concurrent.futures import Executor
+
+    from super_ctf.pacing import PollPolicy
+    from super_ctf.probes import ProbeBatch
+
+
+class Latest[T]:
+    """A single-slot mailbox: `put` overwrites, `get` waits for a fresh value."""
+
+    def __init__(self) -> None:
+        self._value: T | None = None
+        self._error: BaseException | None = None
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, value: T) -> None:
+        if self._ready.is_set():
+            self.dropped += 1
+        self._value = value
+        self._ready.set()
+
+    def fail(self, error: BaseException) -> None:
+        self._error = error
+        self._ready.set()
+
+    async def get(self) -> T:
+        await self._ready.wait()
+        self._ready.clear()
+        if self._error is not None:
+            raise self._error
+        return self._value  # type: ignore[return-value]
+
+
+async def collect_async(probes: ProbeBatch) -> dict[str, Any]:
+    """Run one probe cycle on the batch's executor and await it.
+
+    Each probe is a separate executor call, awaited for at most
+    `probes.timeout` seconds; no thread blocks waiting for the others.
+    """
+    futures = [asyncio.wrap_future(f) for f in probes.submit()]
+    if futures:
+        await asyncio.wait(futures, timeout=probes.timeout)
+    return probes.collect()
+
+
+async def _produce(
+    probes: ProbeBatch,
+    mailbox: Latest[Status],
+    poller: AdaptivePoller,
+) -> None:
+    try:
+        while True:
+            results = await collect_async(probes)
+            status = Status.from_probes(results["service"], results["task"])
+            poller.observe(status)
+            mailbox.put(status)
+            await asyncio.sleep(poller.interval)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:  # noqa: BLE001
+        mailbox.fail(e)
+
+
+async def watch_async(
+    task_name: str = TASK_NAME,
+    probes: ProbeBatch | None = None,
+    policy: PollPolicy | None = None,
+    executor: Executor | None = None,
+    changes_only: bool = False,
+) -> AsyncIterator[Status]:
+    """Asynchronously yield the newest `Status` snapshot.
+
+    `probes` defaults to `default_probe_batch(task_name)`, run on `executor`
+    (default: the shared probe executor, see `super_ctf.probes`).
+    With `changes_only`, snapshots equal to the previously yielded one are
+    skipped. Probe exceptions are re-raised in the consumer.
+    """
+    if probes is None:
+        probes = default_probe_batch(task_name, executor=executor)
+
+    mailbox: Latest[Status] = Latest()
+    producer = asyncio.create_task(
+        _produce(probes, mailbox, AdaptivePoller(policy)),
+        name=f"watch_async({task_name})",
+    )
+    last: Status | None = None
+    try:
+        while True:
+            status = await mailbox.get()
+            if changes_only and status == last:
+                continue
+            last = status
+            yield status
+    finally:
+        producer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await producer
+
+
+type _Item[K, T] = tuple[K, T] | BaseException | None
+
+
+async def _pump[K, T](
+    queue: asyncio.Queue[_Item[K, T]], key: K, stream: AsyncIterator[T]
+) -> None:
+    try:
+        async for item in stream:
+            await queue.put((key, item))
+    except Exception as e:  # noqa: BLE001
+        await queue.put(e)
+    else:
+        await queue.put(None)
+
+
+async def _aclose_all[T](streams: Iterable[AsyncIterator[T]]) -> None:
+    for stream in streams:
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def merge[K, T](
+    streams: dict[K, AsyncIterator[T]],
+) -> AsyncIterator[tuple[K, T]]:
+    """Interleave several async iterators, yielding `(key, item)` pairs.
+
+    Useful to consume many `watch_async` streams from one task. The merged
+    iterator ends when every stream is exhausted; an exception from any
+    stream is re-raised and the remaining streams are closed. The hand-off
+    queue holds a single item, so a slow consumer holds the streams back
+    instead of buffering their output.
+    """
+    queue: asyncio.Queue[_Item[K, T]] = asyncio.Queue(1)
+    tasks = [asyncio.create_task(_pump(queue, k, s)) for k, s in streams.items()]
+    running = len(tasks)
+    try:
+        while running:
+            item = await queue.get()
+            if item is None:
+                running -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await _aclose_all(streams.values())
+
+
+__all__ = ["Latest", "collect_async", "merge", "watch_async"]
@@ -0,0 +1,5 @@
+"""Benchmarks guarding the performance of super-ctf.
+
+Each module can be run directly (`python -m super_ctf.bench.<name>`) and
+exits non-zero when a measurement exceeds its budget.
+"""
@@ -0,0 +1,251 @@
+"""Per-frame cost of the confetti and explosion animations, without a display.
+
+Each scenario runs an animation on a `RecordingCanvas` for a number of
+frames at a given particle count, timing `step()` + `render()` with
+`time.process_time()`, both without and with the time spent in the
+recording canvas' interpreter (which stands in for Tk, so the latter only
+approximates what a real canvas costs), and counting Tcl round trips and
+commands per frame. A scenario fails the check when any of these means
+exceeds the baseline.
+
+The canvases are tall enough for the slowest-falling particles to stay on
+screen until the animation ends, so a run covers its late frames too (the
+confetti fade and faded sprites, sparkle expiry). An animation still ends
+early once every particle has left through the sides; the report lists
+the frames actually run.
+
+Usage:
+    python src/main.py bench-animations
+    python -m super_ctf.bench.animations [frames]
+"""
+
+from __future__ import annotations
+
+import functools
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, NamedTuple
+
+from loguru import logger
+
+from super_ctf.gui.canvas import RecordingCanvas
+from super_ctf.gui.confetti import (
+    CONFETTI_COUNT,
+    FRAME_MS,
+    ConfettiOptions,
+    ConffetiAnimation,
+)
+from super_ctf.gui.explosion import DEFAULT_DEBRIS, ExplosionAnimation
+from super_ctf.gui.metrics import TclCallCounter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+FRAMES = 300
+SEED = 1234
+CANVAS_WIDTH = 400
+# The slowest particles fall ~20000 px over a whole confetti run (350
+# frames), and debris falls ~10000 px below the centre over 200 frames.
+CONFETTI_HEIGHT = 21_000
+EXPLOSION_HEIGHT = 20_000
+
+
+class Budget(NamedTuple):
+    cpu_ms: float  # mean CPU time per frame
+    total_ms: float  # mean CPU time per frame, including the interpreter
+    tcl_calls: float  # mean Tcl round trips per frame
+    tcl_commands: float  # mean Tcl commands per frame
+
+
+# Budgets per (animation, particle count), with headroom over measured
+# baselines. Confetti frames make up to four Tcl calls: coords, sparkles,
+# the fade and culling. Batching keeps the calls flat, but each particle
+# still costs about one command (its coords) per frame while on screen.
+BASELINE: dict[tuple[str, int], Budget] = {
+    ("confetti", 100): Budget(1.5, 2.5, tcl_calls=4.0, tcl_commands=75),
+    ("confetti", CONFETTI_COUNT): Budget(3.0, 5.0, tcl_calls=4.0, tcl_commands=175),
+    ("confetti", 1000): Budget(10.0, 18.0, tcl_calls=4.0, tcl_commands=600),
+    # The struct-of-arrays field is meant to carry ten times the default
+    # count at the same frame rate: the animation's own work must then fit
+    # in half a frame, leaving the other half to Tk.
+    ("confetti", 10 * CONFETTI_COUNT): Budget(
+        FRAME_MS / 2, 45.0, tcl_calls=4.0, tcl_commands=1450
+    ),
+    # sprite mode also renders a few faded sprites per frame before the fade
+    ("confetti-sprites", CONFETTI_COUNT): Budget(
+        3.0, 5.0, tcl_calls=8.0, tcl_commands=185
+    ),
+    ("confetti-sprites", 1000): Budget(8.0, 15.0, tcl_calls=8.0, tcl_commands=680),
+    # where sprites win: tighter than the polygon mode's half frame
+    ("confetti-sprites", 10 * CONFETTI_COUNT): Budget(
+        7.0, 30.0, tcl_calls=8.0, tcl_commands=1650
+    ),
+    ("explosion", DEFAULT_DEBRIS): Budget(1.0, 2.0, tcl_calls=2.0, tcl_commands=80),
+    ("explosion", 600): Budget(3.0, 7.0, tcl_calls=2.0, tcl_commands=290),
+    ("explosion", 2000): Budget(8.0, 22.0, tcl_calls=2.0, tcl_commands=1000),
+}
+
+
+@dataclass
+class FrameProfile:
+    animation: str
+    particles: int
+    cpu_ms: list[float] = field(default_factory=list)
+    # CPU time including the recording canvas' interpreter
+    total_ms: list[float] = field(default_factory=list)
+    tcl_calls: list[int] = field(default_factory=list)
+    # Tcl commands per frame, counting each line of a batched eval
+    tcl_commands: list[int] = field(default_factory=list)
+    creates: int = 0  # canvas items created while running (after spawn)
+
+    @property
+    def frames(self) -> int:
+        return len(self.cpu_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return sum(self.cpu_ms) / len(self.cpu_ms) if self.cpu_ms else 0.0
+
+    @property
+    def p95_ms(self) -> float:
+        samples = sorted(self.cpu_ms)
+        return samples[round(0.95 * (len(samples) - 1))] if samples else 0.0
+
+    @property
+    def mean_total_ms(self) -> float:
+        return sum(self.total_ms) / len(self.total_ms) if self.total_ms else 0.0
+
+    @property
+    def mean_tcl_calls(self) -> float:
+        return sum(self.tcl_calls) / len(self.tcl_calls) if self.tcl_calls else 0.0
+
+    @property
+    def mean_tcl_commands(self) -> float:
+        if not self.tcl_commands:
+            return 0.0
+        return sum(self.tcl_commands) / len(self.tcl_commands)
+
+
+def _frame(step: Callable[[], bool], render: Callable[[], None]) -> Callable[[], bool]:
+    """Return one `step()` + `render()` frame, False once `step()` is done."""
+
+    def frame() -> bool:
+        if not step():
+            return False
+        render()
+        return True
+
+    return frame
+
+
+def _run_frames(
+    profile: FrameProfile,
+    canvas: RecordingCanvas,
+    frame: Callable[[], bool],
+    frames: int,
+    rasterize: bool,
+) -> FrameProfile:
+    counter = TclCallCounter.attach(canvas)
+    creates = canvas.creates
+    for _ in range(frames):
+        commands = counter.commands
+        start, tcl_start = time.process_time(), canvas.tcl_seconds
+        if not frame():
+            break
+        elapsed = time.process_time() - start
+        profile.cpu_ms.append((elapsed - (canvas.tcl_seconds - tcl_start)) * 1000)
+        profile.total_ms.append(elapsed * 1000)
+        profile.tcl_calls.append(counter.end_frame())
+        profile.tcl_commands.append(counter.commands - commands)
+        if rasterize:
+            canvas.rasterize()
+    profile.creates = canvas.creates - creates
+    return profile
+
+
+def run_confetti(
+    count: int, frames: int = FRAMES, rasterize: bool = False, use_sprites: bool = False
+) -> FrameProfile:
+    canvas = RecordingCanvas(CANVAS_WIDTH, CONFETTI_HEIGHT)
+    options = ConfettiOptions(count=count, use_sprites=use_sprites, seed=SEED)
+    anim = ConffetiAnimation(None, canvas=canvas, options=options)
+    anim.create()
+    name = "confetti-sprites" if use_sprites else "confetti"
+    frame = _frame(anim.step, anim.render)
+    return _run_frames(FrameProfile(name, count), canvas, frame, frames, rasterize)
+
+
+def run_explosion(
+    count: int, frames: int = FRAMES, rasterize: bool = False
+) -> FrameProfile:
+    canvas = RecordingCanvas(CANVAS_WIDTH, EXPLOSION_HEIGHT)
+    anim = ExplosionAnimation(None, canvas=canvas, seed=SEED)
+    # the animation culls against its own size, not the canvas'
+    anim.width, anim.height = canvas.width, canvas.height
+    anim.debris.spawn(count, anim.width / 2, anim.height / 2, anim.rng)
+    frame = _frame(anim._step, anim._render)  # noqa: SLF001
+    return _run_frames(
+        FrameProfile("explosion", count), canvas, frame, frames, rasterize
+    )
+
+
+RUNNERS: dict[str, Callable[..., FrameProfile]] = {
+    "confetti": run_confetti,
+    "confetti-sprites": functools.partial(run_confetti, use_sprites=True),
+    "explosion": run_explosion,
+}
+
+
+def check_animations(
+    frames: int = FRAMES, rasterize: bool = False, cpu_scale: float = 1.0
+) -> bool:
+    """Run every scenario in `BASELINE` and report; False on regression.
+
+    `cpu_scale` multiplies the CPU budgets, for slower machines.
+    """
+    ok = True
+    for (animation, count), budget in BASELINE.items():
+        profile = RUNNERS[animation](count, frames, rasterize)
+        cpu_budget = budget.cpu_ms * cpu_scale
+        total_budget = budget.total_ms * cpu_scale
+        print(
+            f"{animation:<16} {count:>5} particles | {profile.frames:>3} frames | "
+            f"cpu {profile.mean_ms:6.3f} ms "
+            f"(p95 {profile.p95_ms:6.3f}, budget {cpu_budget:.1f}) | "
+            f"with tcl {profile.mean_total_ms:6.3f} ms (budget {total_budget:.1f}) | "
+            f"tcl {profile.mean_tcl_calls:4.2f}/frame "
+            f"(budget {budget.tcl_calls:.0f}), "
+            f"{profile.mean_tcl_commands:6.1f} commands/frame "
+            f"(budget {budget.tcl_commands:.0f}) | "
+            f"{profile.creates} items created"
+        )
+        if profile.mean_ms > cpu_budget:
+            logger.error(
+                f"{animation}/{count}: {profile.mean_ms:.3f} ms/frame > {cpu_budget} ms"
+            )
+            ok = False
+        if profile.mean_total_ms > total_budget:
+            logger.error(
+                f"{animation}/{count}: {profile.mean_total_ms:.3f} ms/frame"
+                f" with the interpreter > {total_budget} ms"
+            )
+            ok = False
+        if profile.mean_tcl_calls > budget.tcl_calls:
+            logger.error(
+                f"{animation}/{count}: {profile.mean_tcl_calls:.2f} Tcl calls/frame"
+                f" > {budget.tcl_calls}"
+            )
+            ok = False
+        if profile.mean_tcl_commands > budget.tcl_commands:
+            logger.error(
+                f"{animation}/{count}: {profile.mean_tcl_commands:.1f} Tcl commands"
+                f"/frame > {budget.tcl_commands}"
+            )
+            ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    n_frames = int(sys.argv[1]) if len(sys.argv) > 1 else FRAMES
+    sys.exit(0 if check_animations(n_frames) else 1)
@@ -0,0 +1,210 @@
+"""Cold-start import time of the super-ctf CLI (`src/main.py`), per subcommand.
+
+Every command is started in a fresh interpreter with `-X importtime` and
+`--help`, so the command body never runs and only module-level imports are
+measured. The budgets only cover the `super_ctf` import subtree: the total
+is dominated by typer, loguru and rich, whose import time varies with the
+machine and the disk cache far more than this package's own. The total is
+still reported next to a bare interpreter's `import typer, loguru`, for
+context. A command fails the check if it exits with a non-zero status,
+exceeds its budget or loads one of the heavy modules (tkinter, the GUI,
+pywin32) that only the default app command may need.
+
+Usage:
+    python src/main.py import-time
+    python -m super_ctf.bench.import_time path/to/main.py
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+# Budgets (ms of `super_ctf` subtree import time), several times the
+# measured baselines (4-6 ms).
+COMMANDS: dict[str, tuple[list[str], float]] = {
+    "--help": (["--help"], 30.0),
+    "clean": (["clean", "--help"], 30.0),
+    "import-time": (["import-time", "--help"], 30.0),
+    "bench-animations": (["bench-animations", "--help"], 30.0),
+    "bench-logging": (["bench-logging", "--help"], 30.0),
+    "bench-targets": (["bench-targets", "--help"], 30.0),
+}
+OWN_PACKAGE = "super_ctf"
+# what every command pays before importing anything of its own
+BASELINE_IMPORTS = "import typer, loguru"
+
+# `-X importtime` lines: "import time: self [us] | cumulative | package"
+IMPORTTIME_COLUMNS = 3
+
+HEAVY_MODULES = frozenset(
+    {
+        "tkinter",
+        "super_ctf.gui",
+        "super_ctf.watcher",
+        "pythoncom",
+        "win32com",
+        "win32service",
+        "win32serviceutil",
+        "servicemanager",
+    }
+)
+
+
+@dataclass
+class ImportProfile:
+    command: str
+    import_ms: float
+    wall_ms: float
+    modules: dict[str, float] = field(default_factory=dict)  # self time, ms
+    # cumulative time of the `super_ctf` imports, ms
+    own_ms: float = 0.0
+    returncode: int = 0
+    # stderr without the `-X importtime` lines
+    errors: str = ""
+
+    @property
+    def heavy(self) -> set[str]:
+        return {
+            m
+            for m in self.modules
+            if any(m == h or m.startswith(f"{h}.") for h in HEAVY_MODULES)
+        }
+
+    def slowest(self, n: int = 5) -> list[tuple[str, float]]:
+        return sorted(self.modules.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+def parse_importtime(stderr: str) -> dict[str, float]:
+    """Return `{module: self_ms}` from `-X importtime` output."""
+    modules: dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != IMPORTTIME_COLUMNS or not parts[0].strip().isdigit():
+            continue  # header line
+        modules[parts[2].strip()] = int(parts[0]) / 1000
+    return modules
+
+
+def subtree_ms(stderr: str, package: str = OWN_PACKAGE) -> float:
+    """Return the cumulative import time (ms) of `package` and what it imports.
+
+    `-X importtime` prints each module after the ones it imports, indented
+    one level deeper, so walking the lines backwards visits every module
+    before its imports. Only the outermost `package` modules are counted, as
+    their cumulative time already includes the nested ones.
+    """
+    total = 0.0
+    # (depth, inside `package`) of the modules enclosing the current line
+    stack: list[tuple[int, bool]] = []
+    for line in reversed(stderr.splitlines()):
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != IMPORTTIME_COLUMNS or not parts[1].strip().isdigit():
+            continue  # header line
+        name = parts[2].removeprefix(" ")
+        depth = len(name) - len(name.lstrip())
+        name = name.strip()
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        inside = bool(stack) and stack[-1][1]
+        own = name == package or name.startswith(f"{package}.")
+        if own and not inside:
+            total += int(parts[1]) / 1000
+        stack.append((depth, inside or own))
+    return total
+
+
+def _run_importtime(args: list[str]) -> tuple[subprocess.CompletedProcess, float]:
+    start = time.perf_counter()
+    proc = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return proc, (time.perf_counter() - start) * 1000
+
+
+def measure_baseline(runs: int = 3) -> float:
+    """Return the total import time (ms) of `BASELINE_IMPORTS`, best of `runs`."""
+    return min(
+        sum(
+            parse_importtime(
+                _run_importtime(["-c", BASELINE_IMPORTS])[0].stderr
+            ).values()
+        )
+        for _ in range(max(1, runs))
+    )
+
+
+def measure(script: str | Path, args: list[str], command: str = "") -> ImportProfile:
+    proc, wall_ms = _run_importtime([str(script), *args])
+    modules = parse_importtime(proc.stderr)
+    errors = "\n".join(
+        line for line in proc.stderr.splitlines() if not line.startswith("import time:")
+    )
+    return ImportProfile(
+        command=command or " ".join(args),
+        import_ms=sum(modules.values()),
+        wall_ms=wall_ms,
+        modules=modules,
+        own_ms=subtree_ms(proc.stderr),
+        returncode=proc.returncode,
+        errors=errors,
+    )
+
+
+def check_commands(
+    script: str | Path, budget_ms: float | None = None, runs: int = 3
+) -> bool:
+    """Measure every command (best of `runs`) and report; False on regression.
+
+    `budget_ms` overrides the budget of every command's `super_ctf` subtree.
+    """
+    ok = True
+    baseline_ms = measure_baseline(runs)
+    print(f"{'baseline':<16} imports {baseline_ms:7.1f} ms ({BASELINE_IMPORTS})")
+    for command, (args, default_budget) in COMMANDS.items():
+        profile = min(
+            (measure(script, args, command) for _ in range(max(1, runs))),
+            key=lambda p: p.own_ms,
+        )
+        budget = default_budget if budget_ms is None else budget_ms
+        slowest = ", ".join(f"{m} {ms:.1f}ms" for m, ms in profile.slowest(3))
+        print(
+            f"{command:<16} {OWN_PACKAGE} {profile.own_ms:5.1f} ms"
+            f" (budget {budget:.0f})"
+            f" | imports {profile.import_ms:7.1f} ms"
+            f" (+{profile.import_ms - baseline_ms:.1f} over baseline)"
+            f" | wall {profile.wall_ms:7.1f} ms | {slowest}"
+        )
+        if profile.returncode:
+            logger.error(
+                f"{command}: exited with status {profile.returncode}\n{profile.errors}"
+            )
+            ok = False
+        if profile.own_ms > budget:
+            logger.error(
+                f"{command}: {OWN_PACKAGE} import time {profile.own_ms:.1f} ms"
+                f" > {budget} ms"
+            )
+            ok = False
+        if profile.heavy:
+            logger.error(f"{command}: loads heavy modules {sorted(profile.heavy)}")
+            ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    default_script = Path(__file__).parents[2] / "main.py"
+    main_script = sys.argv[1] if len(sys.argv) > 1 else default_script
+    sys.exit(0 if check_commands(main_script) else 1)
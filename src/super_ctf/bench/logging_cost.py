@@ -0,0 +1,129 @@
+"""Per-poll cost of the watcher's debug logging.
+
+Each scenario replays `POLLS` service + task polls, with the service state
+changing every `CHANGE_EVERY` polls, and times only the logging calls with
+`time.perf_counter()`:
+
+- "eager" is the previous pattern: four f-string `logger.debug` calls per
+  poll, formatted whether or not DEBUG is enabled;
+- "transitions" makes the `TransitionLog` calls of `get_service_info` and
+  `check_task_status`.
+
+Both run with DEBUG on and off, against an enqueued sink that discards the
+records. A scenario fails the check when its mean cost per poll exceeds
+the baseline.
+
+Usage:
+    python src/main.py bench-logging
+    python -m super_ctf.bench.logging_cost [polls]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from super_ctf.logs import TransitionLog, setup_logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+POLLS = 20_000
+CHANGE_EVERY = 50
+SERVICE = "CTFService"
+TASK = "CTFScheduledTask"
+# the two states the replayed service alternates between
+STATES = ((4, "running"), (1, "stopped"))
+
+# Budgets (mean µs of logging per poll), with headroom over measured baselines.
+BASELINE: dict[tuple[str, bool], float] = {
+    ("eager", True): 1000.0,
+    ("eager", False): 15.0,
+    ("transitions", True): 20.0,
+    ("transitions", False): 5.0,
+}
+
+
+def _eager() -> Callable[[int, str], None]:
+    def poll(state: int, state_text: str) -> None:
+        logger.debug(f"✅ Service '{SERVICE}' exists.")
+        logger.debug(f"   → State: {state_text} ({state})")
+        logger.debug(f"   → Enabled: {True} ({'auto'})")
+        logger.debug(f"✅ Task '{TASK}' exists and is ENABLED.")
+
+    return poll
+
+
+def _transitions() -> Callable[[int, str], None]:
+    log = TransitionLog()
+
+    def poll(state: int, state_text: str) -> None:
+        log.debug(
+            ("service", SERVICE),
+            (state, 2),
+            "✅ Service '{}' exists.\n   → State: {} ({})\n   → Enabled: {} ({})",
+            SERVICE,
+            state_text,
+            state,
+            True,
+            "auto",
+        )
+        log.debug(("task", TASK), True, "✅ Task '{}' exists and is ENABLED.", TASK)
+
+    return poll
+
+
+SCENARIOS: dict[str, Callable[[], Callable[[int, str], None]]] = {
+    "eager": _eager,
+    "transitions": _transitions,
+}
+
+
+def run(scenario: str, debug: bool, polls: int = POLLS) -> float:
+    """Return the mean logging cost per poll in µs."""
+    logger.remove()
+    logger.add(lambda _message: None, level="DEBUG" if debug else "INFO", enqueue=True)
+    poll = SCENARIOS[scenario]()
+    elapsed = 0.0
+    for i in range(polls):
+        state, state_text = STATES[(i // CHANGE_EVERY) % len(STATES)]
+        start = time.perf_counter()
+        poll(state, state_text)
+        elapsed += time.perf_counter() - start
+    logger.complete()
+    return elapsed / polls * 1e6
+
+
+def check_logging(
+    polls: int = POLLS, scale: float = 1.0, log_level: str = "DEBUG"
+) -> bool:
+    """Run every scenario in `BASELINE` and report; False on regression.
+
+    `scale` multiplies the budgets, for slower machines. The scenarios
+    replace loguru's sinks; the stderr sink is reinstalled afterwards at
+    `log_level`.
+    """
+    results = {
+        (scenario, debug): run(scenario, debug, polls) for scenario, debug in BASELINE
+    }
+    setup_logging(log_level)
+    ok = True
+    for (scenario, debug), us in results.items():
+        budget = BASELINE[scenario, debug] * scale
+        mode = "debug on" if debug else "debug off"
+        print(
+            f"{scenario:<12} {mode:<9} | {us:8.2f} µs/poll "
+            f"(budget {budget:.1f}) | {polls} polls"
+        )
+        if us > budget:
+            logger.error(f"{scenario}/{mode}: {us:.2f} µs/poll > {budget} µs")
+            ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    n_polls = int(sys.argv[1]) if len(sys.argv) > 1 else POLLS
+    sys.exit(0 if check_logging(n_polls) else 1)
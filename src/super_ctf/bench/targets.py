@@ -0,0 +1,92 @@
+"""Cost of a `check_watch_many` cycle as the number of targets grows.
+
+Each scenario watches `targets` services and as many scheduled tasks
+through the in-memory `FakeSystem` and times `cycles` cycles with
+`time.perf_counter()`. A scenario fails the check when its mean cycle time
+exceeds the budget, or when a cycle makes more backend calls than
+`CALLS_PER_CYCLE`, i.e. when the cost starts growing with the number of
+targets instead of the number of batched calls.
+
+Usage:
+    python src/main.py bench-targets
+    python -m super_ctf.bench.targets [cycles]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import NamedTuple
+
+from loguru import logger
+
+from super_ctf.persistency.fake import FakeService, FakeSystem
+from super_ctf.targets import check_watch_many
+
+CYCLES = 100
+# one service enumeration and one task enumeration
+CALLS_PER_CYCLE = 2.0
+
+# Budgets (mean ms per cycle) per target count, with headroom over measured
+# baselines.
+BASELINE: dict[int, float] = {
+    10: 0.5,
+    1000: 10.0,
+    5000: 40.0,
+}
+
+
+class CycleStats(NamedTuple):
+    targets: int
+    ms_per_cycle: float
+    backend_calls_per_cycle: float
+
+
+def run(targets: int, cycles: int = CYCLES) -> CycleStats:
+    names = [f"CTFService{i}" for i in range(targets)]
+    backend = FakeSystem(
+        services={n: FakeService("running", "auto") for n in names},
+        tasks={f"CTFTask{i}": True for i in range(targets)},
+    )
+    stream = check_watch_many(names, backend.tasks, backend)
+    start = time.perf_counter()
+    for _ in range(cycles):
+        next(stream)
+    elapsed = time.perf_counter() - start
+    return CycleStats(
+        targets=targets,
+        ms_per_cycle=elapsed / cycles * 1000,
+        backend_calls_per_cycle=backend.calls.total() / cycles,
+    )
+
+
+def check_targets(cycles: int = CYCLES, scale: float = 1.0) -> bool:
+    """Run every scenario in `BASELINE` and report; False on regression.
+
+    `scale` multiplies the time budgets, for slower machines.
+    """
+    ok = True
+    for targets, default_budget in BASELINE.items():
+        stats = run(targets, cycles)
+        budget = default_budget * scale
+        print(
+            f"{targets:>6} targets | {stats.ms_per_cycle:8.3f} ms/cycle "
+            f"(budget {budget:.1f}) | {stats.backend_calls_per_cycle:.1f} calls/cycle"
+        )
+        if stats.ms_per_cycle > budget:
+            logger.error(
+                f"{targets} targets: {stats.ms_per_cycle:.3f} ms > {budget} ms"
+            )
+            ok = False
+        if stats.backend_calls_per_cycle > CALLS_PER_CYCLE:
+            logger.error(
+                f"{targets} targets: {stats.backend_calls_per_cycle:.1f} backend calls"
+                f" per cycle > {CALLS_PER_CYCLE}"
+            )
+            ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    n_cycles = int(sys.argv[1]) if len(sys.argv) > 1 else CYCLES
+    sys.exit(0 if check_targets(n_cycles) else 1)
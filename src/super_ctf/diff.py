@@ -0,0 +1,96 @@
+"""Turn a stream of `Status` snapshots into change events.
+
+`StatusDiffer.feed` compares each snapshot with the previous one and returns
+a `StatusDelta` listing only the fields that changed, or None when nothing
+did, so consumers only repaint and log real state transitions. The first
+snapshot is emitted in full. A full snapshot can also be requested at any
+time (from any thread) with `request_snapshot()`, e.g. by a consumer that
+attaches late or has to redraw: the next fed status is then emitted with
+every field, even if it did not change. Feed it every probed status (see
+`super_ctf.watcher.watch_statuses`), not only changed ones, so that the
+request is served at the next probe.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
+    from super_ctf.watcher import Status
+
+
+class FieldChange(NamedTuple):
+    field: str
+    old: Any
+    new: Any
+
+    def __str__(self) -> str:
+        return f"{self.field} changed {self.old}→{self.new}"
+
+
+class StatusDelta(NamedTuple):
+    status: Status
+    changes: tuple[FieldChange, ...]
+    # True for the first snapshot and for requested snapshots; `changes`
+    # then lists every field.
+    full: bool = False
+
+    def __str__(self) -> str:
+        if self.full:
+            fields = ", ".join(f"{c.field}={c.new}" for c in self.changes)
+            return f"snapshot: {fields}"
+        return "; ".join(str(c) for c in self.changes)
+
+
+def diff_status(old: Status | None, new: Status) -> tuple[FieldChange, ...]:
+    """Return the fields that differ between two snapshots."""
+    if old is None:
+        return tuple(
+            FieldChange(f, None, v) for f, v in zip(new._fields, new, strict=True)
+        )
+    return tuple(
+        FieldChange(f, o, n)
+        for f, o, n in zip(new._fields, old, new, strict=True)
+        if o != n
+    )
+
+
+class StatusDiffer:
+    def __init__(self) -> None:
+        self._last: Status | None = None
+        self._snapshot = threading.Event()
+
+    def request_snapshot(self) -> None:
+        """Emit the next fed status in full, even if it did not change."""
+        self._snapshot.set()
+
+    def feed(self, status: Status) -> StatusDelta | None:
+        """Return the delta against the previous snapshot, or None if identical."""
+        last = self._last
+        self._last = status
+        if last is None or self._snapshot.is_set():
+            self._snapshot.clear()
+            return StatusDelta(status, diff_status(None, status), full=True)
+        if status == last:
+            return None
+        return StatusDelta(status, diff_status(last, status))
+
+
+def deltas(
+    statuses: Iterable[Status], differ: StatusDiffer | None = None
+) -> Generator[StatusDelta]:
+    """Yield a `StatusDelta` per real change in `statuses`.
+
+    Pass your own `differ` to be able to call `request_snapshot()` on it.
+    """
+    differ = differ or StatusDiffer()
+    for status in statuses:
+        delta = differ.feed(status)
+        if delta is not None:
+            yield delta
+
+
+__all__ = ["FieldChange", "StatusDelta", "StatusDiffer", "deltas", "diff_status"]
@@ -0,0 +1,366 @@
+"""The canvas interface used by the animations, and a headless implementation.
+
+`AnimationCanvas` is the subset of `tk.Canvas` that `ConffetiAnimation` and
+`ExplosionAnimation` use; a real `tk.Canvas` satisfies it as-is.
+
+`RecordingCanvas` implements it without a display. Its `tk` attribute is a
+small interpreter that executes the canvas commands the animations send,
+either through `tk.call` or as batched `tk.eval` scripts, against an
+in-memory item table, and counts them:
+
+    canvas = RecordingCanvas(400, 200)
+    anim = ConffetiAnimation(None, canvas=canvas)
+    anim.create()
+    anim.step(); anim.render()
+    canvas.coord_updates, canvas.round_trips
+
+`TclCallCounter.attach()` works on it like on a Tk canvas. `rasterize()`
+draws the visible items to an in-memory image and needs Pillow
+(the `bench` extra: `pip install -e ".[bench]"` from a checkout).
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import itertools
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from PIL import Image
+
+
+class AnimationCanvas(Protocol):
+    tk: Any
+
+    def create_polygon(self, *args: Any, **kw: Any) -> int: ...  # noqa: ANN401
+    def create_oval(self, *args: Any, **kw: Any) -> int: ...  # noqa: ANN401
+    def create_rectangle(self, *args: Any, **kw: Any) -> int: ...  # noqa: ANN401
+    def create_image(self, *args: Any, **kw: Any) -> int: ...  # noqa: ANN401
+    def coords(self, tag_or_id: str | int, *args: Any) -> Any: ...  # noqa: ANN401
+    def itemconfigure(self, tag_or_id: str | int, **kw: Any) -> Any: ...  # noqa: ANN401
+    def delete(self, *tags_or_ids: str | int) -> None: ...
+    def tag_raise(self, tag_or_id: str | int) -> None: ...
+    def update_idletasks(self) -> None: ...
+    def winfo_width(self) -> int: ...
+    def winfo_height(self) -> int: ...
+    def after(self, ms: int, func: Callable[[], object]) -> str: ...
+    def after_cancel(self, after_id: str) -> None: ...
+
+
+def split_words(line: str) -> list[str]:
+    """Split one Tcl command into words, honouring `{...}` grouping."""
+    words: list[str] = []
+    word: list[str] = []
+    depth = 0
+    for ch in line:
+        if depth:
+            if ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if not depth:
+                    words.append("".join(word))
+                    word = []
+                    continue
+            word.append(ch)
+        elif ch == "{" and not word:
+            depth = 1
+        elif ch.isspace():
+            if word:
+                words.append("".join(word))
+                word = []
+        else:
+            word.append(ch)
+    if word:
+        words.append("".join(word))
+    return words
+
+
+@dataclass
+class CanvasItem:
+    kind: str
+    coords: list[float]
+    options: dict[str, str] = field(default_factory=dict)
+    tags: set[str] = field(default_factory=set)
+
+    @property
+    def visible(self) -> bool:
+        return self.options.get("state", "normal") != "hidden"
+
+
+class _RecordingTcl:
+    """Executes canvas widget commands against a `RecordingCanvas`."""
+
+    def __init__(self, canvas: RecordingCanvas) -> None:
+        self._canvas = canvas
+
+    def call(self, *args: Any) -> Any:  # noqa: ANN401
+        start = time.process_time()
+        self._canvas.round_trips += 1
+        try:
+            return self._canvas.execute(list(args))
+        finally:
+            self._canvas.tcl_seconds += time.process_time() - start
+
+    def eval(self, script: str) -> Any:  # noqa: ANN401
+        start = time.process_time()
+        self._canvas.round_trips += 1
+        result: Any = ""
+        try:
+            for line in script.splitlines():
+                if line.strip():
+                    result = self._canvas.execute(split_words(line))
+        finally:
+            self._canvas.tcl_seconds += time.process_time() - start
+        return result
+
+
+class RecordingCanvas:
+    """A headless `AnimationCanvas` that records what the animation does."""
+
+    _paths = itertools.count(1)
+
+    def __init__(self, width: int = 400, height: int = 200, bg: str = "black") -> None:
+        self.width = width
+        self.height = height
+        self.bg = bg
+        self._w = f".headless{next(self._paths)}"
+        self.tk: Any = _RecordingTcl(self)
+        # item id -> item, in stacking order (bottom first)
+        self.items: dict[int, CanvasItem] = {}
+        self._ids = itertools.count(1)
+        self._after_ids = itertools.count(1)
+        self.pending: dict[str, Callable[[], object]] = {}
+        # photo image name -> base64 PNG data
+        self.images: dict[str, str] = {}
+        self._image_ids = itertools.count(1)
+        self._decoded: dict[str, Image.Image] = {}
+
+        self.round_trips = 0
+        # CPU time spent in this fake interpreter, which stands in for Tk's
+        # own cost and is excluded from the animation's measurements
+        self.tcl_seconds = 0.0
+        self.creates = 0
+        self.coord_updates = 0
+        self.configs = 0
+        self.deletes = 0
+        self.commands: Counter[str] = Counter()
+        self.last_image: Image.Image | None = None
+
+    def __str__(self) -> str:
+        return self._w
+
+    # === Command interpreter ===
+    def execute(self, words: list[Any]) -> Any:  # noqa: ANN401
+        if words and str(words[0]) == "image":
+            return self._image(words[1:])
+        if not words or str(words[0]) != self._w:
+            msg = f"unsupported command: {words!r}"
+            raise ValueError(msg)
+        command, args = str(words[1]), words[2:]
+        self.commands[command] += 1
+        if command == "create":
+            return self._create(str(args[0]), args[1:])
+        if command == "coords":
+            return self._coords(args[0], args[1:])
+        if command in {"itemconfigure", "itemconfig"}:
+            return self._itemconfigure(args[0], args[1:])
+        if command == "delete":
+            return self._delete(args)
+        if command == "raise":
+            return self._raise(args[0])
+        msg = f"unsupported canvas command: {command}"
+        raise ValueError(msg)
+
+    def _image(self, args: list[Any]) -> str:
+        # `image create photo ?option value ...?` and `image delete name ...`
+        self.commands[f"image {args[0]}"] += 1
+        if str(args[0]) == "delete":
+            for name in args[1:]:
+                self.images.pop(str(name), None)
+                self._decoded.pop(str(name), None)
+            return ""
+        if str(args[0]) == "create" and str(args[1]) == "photo":
+            rest = args[2:]
+            # `image create photo ?name? ?option value ...?`
+            if rest and not str(rest[0]).startswith("-"):
+                name, rest = str(rest[0]), rest[1:]
+            else:
+                name = f"image{next(self._image_ids)}"
+            _, options = self._split_options(rest)
+            self.images[name] = str(options.get("data", ""))
+            return name
+        msg = f"unsupported image command: {args!r}"
+        raise ValueError(msg)
+
+    def find(self, tag_or_id: str | int) -> list[int]:
+        key = str(tag_or_id)
+        if key == "all":
+            return list(self.items)
+        if key.isdigit():
+            return [int(key)] if int(key) in self.items else []
+        return [i for i, item in self.items.items() if key in item.tags]
+
+    @staticmethod
+    def _split_options(args: list[Any]) -> tuple[list[float], dict[str, Any]]:
+        coords: list[float] = []
+        rest = list(args)
+        # options look like "-fill"; negative coordinates like "-12.5"
+        while rest and not str(rest[0])[:2].lstrip("-").isalpha():
+            coords.append(float(rest.pop(0)))
+        pairs = itertools.batched(rest, 2, strict=True)
+        return coords, {str(k).lstrip("-"): v for k, v in pairs}
+
+    @staticmethod
+    def _apply(item: CanvasItem, options: dict[str, Any]) -> None:
+        for key, value in options.items():
+            if key == "tags":
+                tags = split_words(value) if isinstance(value, str) else value
+                item.tags = set(map(str, tags))
+            else:
+                item.options[key] = str(value)
+
+    def _create(self, kind: str, args: list[Any]) -> int:
+        coords, options = self._split_options(args)
+        item_id = next(self._ids)
+        item = CanvasItem(kind, coords)
+        self._apply(item, options)
+        self.items[item_id] = item
+        self.creates += 1
+        return item_id
+
+    def _coords(self, tag_or_id: str | int, args: list[Any]) -> list[float]:
+        ids = self.find(tag_or_id)
+        if not args:
+            return self.items[ids[0]].coords if ids else []
+        coords = [float(c) for c in args]
+        for i in ids:
+            self.items[i].coords = coords
+        self.coord_updates += 1
+        return coords
+
+    def _itemconfigure(self, tag_or_id: str | int, args: list[Any]) -> str:
+        _, options = self._split_options(args)
+        for i in self.find(tag_or_id):
+            self._apply(self.items[i], options)
+        self.configs += 1
+        return ""
+
+    def _delete(self, tags_or_ids: list[Any]) -> str:
+        for tag_or_id in tags_or_ids:
+            for i in self.find(tag_or_id):
+                del self.items[i]
+        self.deletes += 1
+        return ""
+
+    def _raise(self, tag_or_id: str | int) -> str:
+        for i in self.find(tag_or_id):
+            self.items[i] = self.items.pop(i)
+        return ""
+
+    # === tk.Canvas-compatible methods ===
+    @staticmethod
+    def _flatten(kw: dict[str, Any]) -> list[Any]:
+        return [v for key, value in kw.items() for v in (f"-{key}", value)]
+
+    def _create_item(self, kind: str, args: tuple[Any, ...], kw: dict[str, Any]) -> int:
+        return self.tk.call(self._w, "create", kind, *args, *self._flatten(kw))
+
+    def create_polygon(self, *args: Any, **kw: Any) -> int:  # noqa: ANN401
+        return self._create_item("polygon", args, kw)
+
+    def create_oval(self, *args: Any, **kw: Any) -> int:  # noqa: ANN401
+        return self._create_item("oval", args, kw)
+
+    def create_rectangle(self, *args: Any, **kw: Any) -> int:  # noqa: ANN401
+        return self._create_item("rectangle", args, kw)
+
+    def create_image(self, *args: Any, **kw: Any) -> int:  # noqa: ANN401
+        return self._create_item("image", args, kw)
+
+    def coords(self, tag_or_id: str | int, *args: Any) -> Any:  # noqa: ANN401
+        return self.tk.call(self._w, "coords", tag_or_id, *args)
+
+    def itemconfigure(self, tag_or_id: str | int, **kw: Any) -> Any:  # noqa: ANN401
+        return self.tk.call(self._w, "itemconfigure", tag_or_id, *self._flatten(kw))
+
+    itemconfig = itemconfigure
+
+    def delete(self, *tags_or_ids: str | int) -> None:
+        self.tk.call(self._w, "delete", *tags_or_ids)
+
+    def tag_raise(self, tag_or_id: str | int) -> None:
+        self.tk.call(self._w, "raise", tag_or_id)
+
+    def update_idletasks(self) -> None:
+        pass
+
+    def winfo_width(self) -> int:
+        return self.width
+
+    def winfo_height(self) -> int:
+        return self.height
+
+    def after(self, ms: int, func: Callable[[], object]) -> str:  # noqa: ARG002
+        """Record `func`; nothing runs it unless the caller does (`pending`)."""
+        after_id = f"after#{next(self._after_ids)}"
+        self.pending[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id: str) -> None:
+        self.pending.pop(after_id, None)
+
+    # === Rasterising ===
+    def rasterize(self) -> Image.Image:
+        """Draw the visible items to an in-memory image (needs Pillow)."""
+        try:
+            from PIL import Image, ImageDraw  # noqa: PLC0415
+        except ImportError as e:
+            msg = 'rasterising needs Pillow (pip install -e ".[bench]")'
+            raise RuntimeError(msg) from e
+
+        image = Image.new("RGB", (self.width, self.height), self.bg)
+        draw = ImageDraw.Draw(image)
+        for item in self.items.values():
+            if item.kind == "image" and item.visible:
+                self._paste(image, item)
+                continue
+            fill = item.options.get("fill") or None
+            if not item.visible or fill is None:
+                continue
+            coords = item.coords
+            if item.kind == "polygon" and len(coords) >= 6:  # noqa: PLR2004
+                draw.polygon(coords, fill=fill)
+            elif item.kind in {"oval", "rectangle"} and len(coords) == 4:  # noqa: PLR2004
+                x0, y0, x1, y1 = coords
+                box = (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+                if item.kind == "oval":
+                    draw.ellipse(box, fill=fill)
+                else:
+                    draw.rectangle(box, fill=fill)
+        self.last_image = image
+        return image
+
+    def _paste(self, image: Image.Image, item: CanvasItem) -> None:
+        from PIL import Image  # noqa: PLC0415
+
+        name = item.options.get("image", "")
+        if name not in self.images or len(item.coords) != 2:  # noqa: PLR2004
+            return
+        sprite = self._decoded.get(name)
+        if sprite is None:
+            png = base64.b64decode(self.images[name])
+            sprite = self._decoded[name] = Image.open(io.BytesIO(png)).convert("RGBA")
+        # images are anchored at their centre by default
+        x = round(item.coords[0] - sprite.width / 2)
+        y = round(item.coords[1] - sprite.height / 2)
+        image.paste(sprite, (x, y), sprite)
+
+
+__all__ = ["AnimationCanvas", "CanvasItem", "RecordingCanvas", "split_words"]
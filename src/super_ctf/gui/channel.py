@@ -0,0 +1,103 @@
+"""A one-way channel from a worker thread to the Tk thread.
+
+Tkinter widgets may only be touched from the thread running the mainloop.
+The watcher thread therefore never calls into the GUI: it `post()`s events
+to a `UiChannel`, and the Tk side `drain()`s them from an `after()` tick.
+
+The channel is a `collections.deque`, whose `append` and `popleft` are
+atomic, so neither side takes a lock. With a single consumer that only
+cares about the newest state, a bounded queue is enough: when the Tk loop
+is stalled and the queue is full, the oldest events are dropped (and
+counted). `stats()` reports the queue depth and the drain rate.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+CHANNEL_DEPTH = 64
+
+
+class ChannelStats(NamedTuple):
+    posted: int
+    drained: int
+    dropped: int
+    # drain ticks, and those that found at least one event
+    ticks: int
+    busy_ticks: int
+    depth: int
+    max_depth: int
+    # events drained per second since the first drain
+    drain_rate: float
+
+
+class UiChannel[T]:
+    def __init__(
+        self, maxlen: int = CHANNEL_DEPTH, now: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.maxlen = maxlen
+        self.now = now
+        self._items: deque[T] = deque(maxlen=maxlen)
+        # written by the producer thread only
+        self.posted = 0
+        self.dropped = 0
+        self.max_depth = 0
+        # written by the consumer (Tk) thread only
+        self.drained = 0
+        self.ticks = 0
+        self.busy_ticks = 0
+        self._first_drain: float | None = None
+        self._last_drain = 0.0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def post(self, item: T) -> None:
+        """Queue `item` for the Tk thread; safe to call from any thread."""
+        depth = len(self._items)
+        if depth >= self.maxlen:
+            self.dropped += 1
+        self._items.append(item)
+        self.posted += 1
+        self.max_depth = max(self.max_depth, min(depth + 1, self.maxlen))
+
+    def drain(self) -> list[T]:
+        """Remove and return every queued event, oldest first."""
+        items: list[T] = []
+        pop = self._items.popleft
+        while True:
+            try:
+                items.append(pop())
+            except IndexError:
+                break
+        now = self.now()
+        if self._first_drain is None:
+            self._first_drain = now
+        self._last_drain = now
+        self.ticks += 1
+        if items:
+            self.busy_ticks += 1
+            self.drained += len(items)
+        return items
+
+    def stats(self) -> ChannelStats:
+        first = self._first_drain
+        elapsed = self._last_drain - first if first is not None else 0.0
+        return ChannelStats(
+            posted=self.posted,
+            drained=self.drained,
+            dropped=self.dropped,
+            ticks=self.ticks,
+            busy_ticks=self.busy_ticks,
+            depth=len(self._items),
+            max_depth=self.max_depth,
+            drain_rate=self.drained / elapsed if elapsed > 0 else 0.0,
+        )
+
+
+__all__ = ["CHANNEL_DEPTH", "ChannelStats", "UiChannel"]
@@ -0,0 +1,159 @@
+"""A frame clock shared by the Tk animations.
+
+Physics runs on fixed time steps (`step_ms`), decoupled from rendering:
+
+- each tick runs as many `update()` steps as the elapsed time calls for, up
+  to `max_catchup`; steps beyond that are dropped so a long stall does not
+  fast-forward the animation;
+- if the tick is already over budget once the steps are done, the
+  `render()` call is skipped and counted as a dropped frame;
+- the next tick is scheduled for the next step boundary (rounded up to the
+  next millisecond), taking the time spent in this tick into account,
+  instead of a fixed `after()` delay.
+
+On a slow machine the animation therefore keeps its real-time speed and
+drops frames instead of slowing down. `stats()` reports fps, frame-time
+percentiles and dropped frame/step counts.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import math
+import time
+import tkinter as tk
+from collections import deque
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from super_ctf.gui.canvas import AnimationCanvas
+
+FRAME_SAMPLES = 240
+
+
+class FrameStats(NamedTuple):
+    frames: int
+    fps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    dropped_frames: int
+    dropped_steps: int
+
+
+def _percentile(sorted_samples: list[float], q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, round(q * (len(sorted_samples) - 1)))
+    return sorted_samples[index]
+
+
+class FrameClock:
+    # the time source; replace it on an instance to drive the clock by hand
+    now: Callable[[], float] = staticmethod(time.perf_counter)
+
+    def __init__(
+        self,
+        widget: tk.Misc | AnimationCanvas,
+        update: Callable[[], bool],
+        render: Callable[[], None],
+        step_ms: float = 20.0,
+        max_catchup: int = 4,
+    ) -> None:
+        """`update()` advances one physics step and returns False when done."""
+        self.widget = widget
+        self.update = update
+        self.render = render
+        self.step = step_ms / 1000
+        self.max_catchup = max_catchup
+
+        self.running = False
+        self.on_finish: Callable[[], None] | None = None
+        self._after_id: str | None = None
+        self._accumulator = 0.0
+        self._last = 0.0
+        self._started = 0.0
+
+        self.frames = 0
+        self.dropped_frames = 0
+        self.dropped_steps = 0
+        self.frame_times: deque[float] = deque(maxlen=FRAME_SAMPLES)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._started = self._last = self.now()
+        # the first step runs immediately
+        self._accumulator = self.step
+        self._tick()
+
+    def stop(self) -> None:
+        self.running = False
+        if self._after_id is not None:
+            with contextlib.suppress(tk.TclError):
+                self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _finish(self) -> None:
+        self.stop()
+        if self.on_finish is not None:
+            self.on_finish()
+
+    def _tick(self) -> None:
+        self._after_id = None
+        if not self.running:
+            return
+        try:
+            self._run_tick()
+        except tk.TclError:
+            # the canvas went away (e.g. its window was destroyed)
+            self.stop()
+
+    def _run_tick(self) -> None:
+        tick_start = self.now()
+        self._accumulator += tick_start - self._last
+        self._last = tick_start
+
+        steps = int(self._accumulator / self.step)
+        if steps > self.max_catchup:
+            self.dropped_steps += steps - self.max_catchup
+            self._accumulator -= (steps - self.max_catchup) * self.step
+            steps = self.max_catchup
+        for _ in range(steps):
+            self._accumulator -= self.step
+            if not self.update():
+                self._finish()
+                return
+
+        if steps and self.now() - tick_start < self.step:
+            self.render()
+            self.frames += 1
+        elif steps:
+            self.dropped_frames += 1
+
+        tick_end = self.now()
+        if steps:
+            # a tick that ran no step says nothing about the frame time
+            self.frame_times.append(tick_end - tick_start)
+        delay = max(0.0, self.step - self._accumulator - (tick_end - self._last))
+        # round up: a tick that fires before the boundary runs no step
+        self._after_id = self.widget.after(math.ceil(delay * 1000), self._tick)
+
+    def stats(self) -> FrameStats:
+        samples = sorted(self.frame_times)
+        elapsed = (self._last - self._started) or 1.0
+        return FrameStats(
+            frames=self.frames,
+            fps=self.frames / elapsed,
+            p50_ms=_percentile(samples, 0.50) * 1000,
+            p95_ms=_percentile(samples, 0.95) * 1000,
+            p99_ms=_percentile(samples, 0.99) * 1000,
+            dropped_frames=self.dropped_frames,
+            dropped_steps=self.dropped_steps,
+        )
+
+
+__all__ = ["FrameClock", "FrameStats"]
@@ -1,9 +1,14 @@
+import contextlib
+import math
 import random
 import tkinter as tk
-import math
-from typing import Tuple
+from dataclasses import dataclass
 
 from . import CanvasSettings
+from .canvas import AnimationCanvas
+from .clock import FrameClock
+from .metrics import TclCallCounter
+from .sprites import ROTATION_BUCKETS, SpriteAtlas
 
 # Brighter, varied palette
 POSSIBLE_COLORS: list[str] = [
@@ -25,8 +30,21 @@ CONFETTI_COUNT: int = 260
 ROTATION_MAX = 8.0
 WIND_FORCE = 0.6  # gentle horizontal drift over time
 SPARKLE_CHANCE = 0.08
+SPARKLE_POOL_SIZE = 96  # max sparkles visible at once; extra ones are skipped
+SPARKLE_FRAMES = 4  # sparkle lifetime (~90 ms at FRAME_MS per frame)
 FADE_START = 220
 TOTAL_FRAMES = 350
+CULL_MARGIN = 40  # particles this far outside the canvas are culled
+FRAME_MS = 20
+
+SHAPE_RECT = 0
+SHAPE_OVAL = 1
+
+# Sprite mode: particle sizes are snapped to these, and the fade runs in a
+# few discrete levels so each one is a single set of pre-rendered sprites.
+SPRITE_SIZES = (6.5, 9.5, 12.5)
+SPRITE_FADE_LEVELS = 4
+SPRITE_RENDERS_PER_FRAME = 8  # faded sprites rendered ahead per frame
 
 
 def _hex_fade(hex_color: str, factor: float) -> str:
@@ -42,176 +60,633 @@ def _hex_fade(hex_color: str, factor: float) -> str:
     return f"#{r:02x}{g:02x}{b:02x}"
 
 
-class Particle:
-    """A single confetti particle (rectangle or circle)."""
+FADE_STEPS = max(1, TOTAL_FRAMES - FADE_START)
+# FADE_TABLE[colour index][step]: palette colour faded for step 0..FADE_STEPS
+FADE_TABLE: list[list[str]] = [
+    [
+        _hex_fade(color, max(0.0, 1.0 - step / FADE_STEPS))
+        for step in range(FADE_STEPS + 1)
+    ]
+    for color in POSSIBLE_COLORS
+]
+# SPRITE_PALETTES[level]: the palette used for fade level 0..SPRITE_FADE_LEVELS-1
+SPRITE_PALETTES: list[list[str]] = [
+    list(POSSIBLE_COLORS),
+    *(
+        [
+            FADE_TABLE[color][level * FADE_STEPS // SPRITE_FADE_LEVELS]
+            for color in range(len(POSSIBLE_COLORS))
+        ]
+        for level in range(1, SPRITE_FADE_LEVELS)
+    ),
+]
+# The faded sprites are rendered a few per frame, starting this many frames
+# before FADE_START so that they are all ready when the fade begins.
+FADED_SPRITES = (
+    (SPRITE_FADE_LEVELS - 1)
+    * len(POSSIBLE_COLORS)
+    * len(SPRITE_SIZES)
+    * (ROTATION_BUCKETS + 1)
+)
+FADE_LEAD_FRAMES = -(-FADED_SPRITES // SPRITE_RENDERS_PER_FRAME)
+
+
+def _color_tag(color: int) -> str:
+    return f"confetti-c{color}"
+
+
+def _push_coords(canvas: AnimationCanvas, updates: list[str]) -> None:
+    """Send many `coords` commands to Tk in a single Tcl round trip."""
+    if updates:
+        canvas.tk.eval("\n".join(updates))
+
+
+def _bernoulli_schedule(
+    rng: random.Random, p: float, frames: int, count: int
+) -> list[list[int]]:
+    """For each frame, the particles (of `count`) that fire with probability `p`.
+
+    Equivalent to one `rng.random() < p` test per particle per frame, but
+    draws the gaps between hits from a geometric distribution, so it costs
+    one RNG call per hit instead of one per test.
+    """
+    schedule: list[list[int]] = [[] for _ in range(frames)]
+    if p <= 0 or count <= 0:
+        return schedule
+    log_miss = math.log1p(-p) if p < 1 else -math.inf
+    total = frames * count
+    k = -1
+    while True:
+        k += 1 + int(math.log(1.0 - rng.random()) / log_miss)
+        if k >= total:
+            return schedule
+        schedule[k // count].append(k % count)
+
+
+@dataclass
+class BurstPlan:
+    """Every random draw of one confetti burst, made up front.
+
+    `draw()` fills the initial particle columns and the sparkle schedule for
+    the whole animation from one `random.Random`, so the frame loop makes
+    no RNG calls and a seed reproduces a run exactly.
+    """
+
+    shape: list[int]
+    color: list[int]
+    size: list[float]
+    x: list[float]
+    y: list[float]
+    vx: list[float]
+    vy: list[float]
+    angle: list[float]
+    avel: list[float]
+    # sparkles[frame]: the particles that sparkle on that frame
+    sparkles: list[list[int]]
+
+    def __len__(self) -> int:
+        return len(self.shape)
+
+    @classmethod
+    def draw(
+        cls,
+        rng: random.Random,
+        count: int,
+        width: float,
+        frames: int = TOTAL_FRAMES + 1,
+    ) -> "BurstPlan":
+        """Spread `count` particles across `width`, slightly above the visible area."""
+        size = [rng.uniform(5, 14) for _ in range(count)]
+        return cls(
+            shape=[rng.choice((SHAPE_RECT, SHAPE_OVAL)) for _ in range(count)],
+            color=[rng.randrange(len(POSSIBLE_COLORS)) for _ in range(count)],
+            size=size,
+            x=[rng.uniform(0, width) + s / 2 for s in size],
+            y=[rng.uniform(-40, 30) + s / 2 for s in size],
+            vx=[rng.uniform(-BURST_SPEED, BURST_SPEED) * 0.6 for _ in range(count)],
+            vy=[rng.uniform(1, BURST_SPEED) for _ in range(count)],
+            angle=[rng.uniform(0, 360) for _ in range(count)],
+            avel=[rng.uniform(-ROTATION_MAX, ROTATION_MAX) for _ in range(count)],
+            # occasional sparkles for small visual punch
+            sparkles=_bernoulli_schedule(rng, SPARKLE_CHANCE, frames, count),
+        )
+
+
+class ParticleField:
+    """All confetti particles, stored as a struct of arrays.
+
+    Each attribute is a flat list indexed by particle, so physics, wind and
+    rotation are computed for the whole batch in one pass per frame and the
+    resulting coordinates are pushed to Tk in a single Tcl call. Positions
+    (particle centres) are owned here and never read back from the canvas.
+    The pass itself is a plain Python loop (the package does not depend on
+    NumPy); `super_ctf.bench.animations` checks that ten times
+    `CONFETTI_COUNT` particles still step and render in half a frame.
+
+    Canvas items outlive a run: `clear()` hides them and keeps them in
+    per-shape pools that the next `spawn()` re-seeds. Particles that leave
+    the canvas are culled as they go (`step()`): their item is hidden and
+    pooled and the particle is swap-removed from the arrays, so the frame
+    cost follows the number of particles still on screen.
+
+    With a `SpriteAtlas`, particles are image items instead: each frame only
+    moves them, and switches the image when the rotation bucket (or fade
+    level) changes, so no polygon geometry is computed per frame.
+    """
+
+    TAG = "confetti"
 
-    def __init__(self, canvas: tk.Canvas, x: float, y: float):
+    def __init__(
+        self, canvas: AnimationCanvas, sprites: SpriteAtlas | None = None
+    ) -> None:
         self.canvas = canvas
-        self.shape = random.choice(("rect", "oval"))
-        self.color = random.choice(POSSIBLE_COLORS)
-        self.size = random.uniform(5, 14)
-
-        # Start position
-        self.x = x
-        self.y = y
-
-        # Velocities
-        self.vx = random.uniform(-BURST_SPEED, BURST_SPEED) * 0.6
-        self.vy = random.uniform(1, BURST_SPEED)
-
-        # Angular rotation (for rects)
-        self.angle = random.uniform(0, 360)
-        self.avel = random.uniform(-ROTATION_MAX, ROTATION_MAX)
-
-        # Lifetime frames
-        self.age = 0
-
-        # Draw
-        if self.shape == "rect":
-            self.id = self._create_rect(self.x, self.y)
-        else:
-            self.id = self.canvas.create_oval(
-                self.x, self.y, self.x + self.size, self.y + self.size, fill=self.color, outline=""
+        self.sprites = sprites
+        # palette used for sprites; faded in steps by `fade()`
+        self._palette = SPRITE_PALETTES[0]
+        # current image of each particle (sprite mode)
+        self.image: list[str] = []
+        self._free: dict[int, list[int]] = {SHAPE_RECT: [], SHAPE_OVAL: []}
+        self.ids: list[int] = []
+        self.shape: list[int] = []
+        self.color: list[int] = []
+        self.size: list[float] = []
+        self.x: list[float] = []
+        self.y: list[float] = []
+        self.vx: list[float] = []
+        self.vy: list[float] = []
+        self.angle: list[float] = []
+        self.avel: list[float] = []
+        # Rectangle half extents (w = 1.4 * size, h = 0.8 * size)
+        self.hw: list[float] = []
+        self.hh: list[float] = []
+        self.sparkles: list[list[int]] = []
+        # index of each particle in its BurstPlan, and the reverse mapping
+        # (-1 once culled), to follow the sparkle schedule across removals
+        self.plan_index: list[int] = []
+        self._slot: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def reserve(self, per_shape: int) -> None:
+        """Pre-create hidden items so later spawns allocate nothing in Tk."""
+        for shape, pool in self._free.items():
+            missing = max(0, per_shape - len(pool))
+            pool.extend(self._create_item(shape) for _ in range(missing))
+
+    def _create_item(self, shape: int) -> int:
+        if self.sprites is not None:
+            return self.canvas.create_image(0, 0, state="hidden", tags=(self.TAG,))
+        if shape == SHAPE_RECT:
+            return self.canvas.create_polygon(
+                0, 0, 0, 0, 0, 0, outline="", state="hidden", tags=(self.TAG,)
             )
-
-    def _create_rect(self, x: float, y: float) -> int:
-        w = self.size * 1.4
-        h = self.size * 0.8
-        # points centered at x,y
-        pts = [(-w / 2, -h / 2), (w / 2, -h / 2), (w / 2, h / 2), (-w / 2, h / 2)]
-        coords = self._rotated_points(x + self.size / 2, y + self.size / 2, pts, self.angle)
-        return self.canvas.create_polygon(coords, fill=self.color, outline="")
-
-    def _rotated_points(self, cx: float, cy: float, pts: list[Tuple[float, float]], angle: float) -> list[float]:
-        rad = math.radians(angle)
+        return self.canvas.create_oval(
+            0, 0, 0, 0, outline="", state="hidden", tags=(self.TAG,)
+        )
+
+    def spawn(self, plan: BurstPlan) -> None:
+        """Seed the particles drawn in `plan`.
+
+        Canvas items left over from earlier runs are re-seeded in place;
+        new ones are only created when the pool for a shape runs dry.
+        """
+        self.clear()
+        size = plan.size
+        if self.sprites is not None:
+            last = len(SPRITE_SIZES) - 1
+            size = [SPRITE_SIZES[min(last, int((s - 5) / 3))] for s in size]
+        self.shape.extend(plan.shape)
+        self.color.extend(plan.color)
+        self.size.extend(size)
+        self.x.extend(plan.x)
+        self.y.extend(plan.y)
+        self.vx.extend(plan.vx)
+        self.vy.extend(plan.vy)
+        self.angle.extend(plan.angle)
+        self.avel.extend(plan.avel)
+        self.hw.extend(s * 0.7 for s in size)
+        self.hh.extend(s * 0.4 for s in size)
+        self.sparkles = plan.sparkles
+        self.plan_index.extend(range(len(plan)))
+        self._slot = list(range(len(plan)))
+        for shape in plan.shape:
+            pool = self._free[shape]
+            self.ids.append(pool.pop() if pool else self._create_item(shape))
+
+        # Position, colour and show every item in one Tcl round trip. Items
+        # are tagged by colour so fades can address all same-coloured items.
+        path = str(self.canvas)
+        updates: list[str] = []
+        if self.sprites is not None:
+            for i, item in enumerate(self.ids):
+                image = self._sprite(i)
+                self.image.append(image)
+                updates.append(f"{path} coords {item} {self.x[i]:.1f} {self.y[i]:.1f}")
+                updates.append(
+                    f"{path} itemconfigure {item} -image {image} -state normal"
+                )
+            _push_coords(self.canvas, updates)
+            return
+        for i, item in enumerate(self.ids):
+            color = self.color[i]
+            updates.append(f"{path} coords {item} {self._coords_str(i)}")
+            updates.append(
+                f"{path} itemconfigure {item} -fill {POSSIBLE_COLORS[color]}"
+                f" -tags {{{self.TAG} {_color_tag(color)}}} -state normal"
+            )
+        _push_coords(self.canvas, updates)
+
+    def _sprite(self, i: int) -> str:
+        sprites = self.sprites
+        assert sprites is not None  # noqa: S101
+        color = self._palette[self.color[i]]
+        if self.shape[i] == SHAPE_RECT:
+            return sprites.rect(color, self.size[i], self.angle[i])
+        return sprites.disc(color, self.size[i])
+
+    def _rect_coords(self, i: int) -> list[float]:
+        rad = math.radians(self.angle[i])
         cos_a = math.cos(rad)
         sin_a = math.sin(rad)
-        out: list[float] = []
-        for px, py in pts:
-            rx = px * cos_a - py * sin_a + cx
-            ry = px * sin_a + py * cos_a + cy
-            out.extend([rx, ry])
-        return out
-
-    def update(self, frame: int) -> None:
-        # Apply physics
-        self.vy += GRAVITY
-        # gentle wind that changes a bit with time
-        self.vx += math.sin((self.age + frame) * 0.02) * (WIND_FORCE * 0.02)
-
-        self.canvas.move(self.id, self.vx, self.vy)
-        self.age += 1
-
-        # Rotate rectangles by recomputing polygon points
-        if self.shape == "rect":
-            self.angle += self.avel
-            # get current bbox center to compute rotation around center
-            coords = self.canvas.coords(self.id)
-            if len(coords) >= 2:
-                cx = sum(coords[::2]) / (len(coords) // 2)
-                cy = sum(coords[1::2]) / (len(coords) // 2)
-            else:
-                cx, cy = self.x, self.y
-            # recompute rotated points
-            w = self.size * 1.4
-            h = self.size * 0.8
-            pts = [(-w / 2, -h / 2), (w / 2, -h / 2), (w / 2, h / 2), (-w / 2, h / 2)]
-            new_coords = self._rotated_points(cx, cy, pts, self.angle)
-            try:
-                self.canvas.coords(self.id, *new_coords)
-            except tk.TclError:
-                # item might be deleted
-                pass
-
-        # occasional sparkles for small visual punch
-        if random.random() < SPARKLE_CHANCE:
-            try:
-                bx = self.canvas.bbox(self.id)
-                if bx:
-                    sx = (bx[0] + bx[2]) / 2
-                    sy = (bx[1] + bx[3]) / 2
-                    sz = max(1.0, self.size * 0.2)
-                    sparkle = self.canvas.create_oval(sx - sz, sy - sz, sx + sz, sy + sz, fill="#FFFFFF", outline="")
-                    # remove sparkle shortly
-                    self.canvas.after(90, lambda i=sparkle: self.canvas.delete(i))
-            except tk.TclError:
-                pass
-
-    def fade(self, factor: float) -> None:
-        try:
-            newc = _hex_fade(self.color, factor)
-            self.canvas.itemconfig(self.id, fill=newc)
-        except tk.TclError:
-            pass
+        hw, hh, cx, cy = self.hw[i], self.hh[i], self.x[i], self.y[i]
+        # corners (-hw,-hh), (hw,-hh), (hw,hh), (-hw,hh) rotated around (cx, cy)
+        ax, ay = hw * cos_a, hw * sin_a
+        bx, by = -hh * sin_a, hh * cos_a
+        return [
+            cx - ax - bx, cy - ay - by,
+            cx + ax - bx, cy + ay - by,
+            cx + ax + bx, cy + ay + by,
+            cx - ax + bx, cy - ay + by,
+        ]  # fmt: skip
+
+    def step(self, frame: int, width: float, height: float) -> None:
+        """Advance the physics of every particle by one frame and cull the
+        ones that left the `width` x `height` canvas.
+        """
+        # All particles are spawned together, so the wind phase is shared.
+        wind = math.sin(2 * frame * 0.02) * (WIND_FORCE * 0.02)
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        angle, avel = self.angle, self.avel
+        right = width + CULL_MARGIN
+        bottom = height + CULL_MARGIN
+        gone: list[int] = []
+        for i in range(len(self.ids)):
+            vy[i] += GRAVITY
+            vx[i] += wind
+            x[i] += vx[i]
+            y[i] += vy[i]
+            angle[i] += avel[i]
+            if y[i] > bottom or x[i] < -CULL_MARGIN or x[i] > right:
+                gone.append(i)
+        if gone:
+            self._cull(gone)
+
+    def _columns(self) -> list[list]:
+        columns: list[list] = [
+            self.ids, self.shape, self.color, self.size, self.x, self.y,
+            self.vx, self.vy, self.angle, self.avel, self.hw, self.hh,
+            self.plan_index,
+        ]  # fmt: skip
+        if self.sprites is not None:
+            columns.append(self.image)
+        return columns
+
+    def _cull(self, gone: list[int]) -> None:
+        """Hide and pool the particles at the (ascending) indices `gone`.
+
+        Each one is swap-removed: the last particle moves into its slot, so
+        removal costs O(culled) rather than a pass over every particle.
+        Culled items also drop their colour tag, so fades skip them.
+        """
+        path = str(self.canvas)
+        columns = self._columns()
+        ids, shape, plan_index, slot = self.ids, self.shape, self.plan_index, self._slot
+        updates: list[str] = []
+        # descending, so the last particle is never one still to be removed
+        for i in reversed(gone):
+            item = ids[i]
+            self._free[shape[i]].append(item)
+            updates.append(
+                f"{path} itemconfigure {item} -state hidden -tags {self.TAG}"
+            )
+            slot[plan_index[i]] = -1
+            last = len(ids) - 1
+            if i != last:
+                for column in columns:
+                    column[i] = column[last]
+                slot[plan_index[i]] = i
+            for column in columns:
+                column.pop()
+        _push_coords(self.canvas, updates)
+
+    def _coords_str(self, i: int) -> str:
+        if self.shape[i] == SHAPE_RECT:
+            coords = self._rect_coords(i)
+        else:
+            r = self.size[i] / 2
+            cx, cy = self.x[i], self.y[i]
+            coords = [cx - r, cy - r, cx + r, cy + r]
+        return " ".join(f"{c:.1f}" for c in coords)
+
+    def render(self) -> None:
+        """Push every particle's coordinates to Tk in one batch."""
+        path = str(self.canvas)
+        if self.sprites is not None:
+            updates: list[str] = []
+            x, y, image = self.x, self.y, self.image
+            for i, item in enumerate(self.ids):
+                updates.append(f"{path} coords {item} {x[i]:.1f} {y[i]:.1f}")
+                sprite = self._sprite(i)
+                if sprite != image[i]:
+                    image[i] = sprite
+                    updates.append(f"{path} itemconfigure {item} -image {sprite}")
+            _push_coords(self.canvas, updates)
+            return
+        _push_coords(
+            self.canvas,
+            [
+                f"{path} coords {item} {self._coords_str(i)}"
+                for i, item in enumerate(self.ids)
+            ],
+        )
+
+    def exit_frame(self, height: float) -> int:
+        """Return a frame by which every particle has fallen off the bottom of
+        a `height` canvas (some may leave earlier through the sides).
+        """
+        bottom = height + CULL_MARGIN
+        half_g = GRAVITY / 2
+        last = 0
+        for y, vy in zip(self.y, self.vy, strict=True):
+            # after t steps, y + vy*t + GRAVITY*t*(t+1)/2 (see `step()`)
+            b = vy + half_g
+            t = (-b + math.sqrt(b * b + 4 * half_g * max(0.0, bottom - y))) / GRAVITY
+            last = max(last, math.floor(t) + 1)
+        return last
+
+    def sparkle_candidates(self, frame: int) -> list[int]:
+        """Return the particles that sparkle on `frame`, from the burst's schedule."""
+        if frame >= len(self.sparkles):
+            return []
+        slot = self._slot
+        return [i for k in self.sparkles[frame] if (i := slot[k]) >= 0]
+
+    def fade(self, step: int) -> None:
+        """Apply fade `step` (0..FADE_STEPS) with one tag-wide fill per colour."""
+        step = min(max(step, 0), FADE_STEPS)
+        if self.sprites is not None:
+            # switch to the level's sprites on the next render
+            level = step * SPRITE_FADE_LEVELS // (FADE_STEPS + 1)
+            self._palette = SPRITE_PALETTES[level]
+            return
+        path = str(self.canvas)
+        _push_coords(
+            self.canvas,
+            [
+                f"{path} itemconfigure {_color_tag(color)}"
+                f" -fill {FADE_TABLE[color][step]}"
+                for color in range(len(POSSIBLE_COLORS))
+            ],
+        )
+
+    def clear(self) -> None:
+        """Hide every particle's item, return it to the pool and empty the arrays."""
+        if self.ids:
+            with contextlib.suppress(tk.TclError):
+                self.canvas.itemconfigure(self.TAG, state="hidden")
+            for item, shape in zip(self.ids, self.shape, strict=True):
+                self._free[shape].append(item)
+        self._clear_columns()
+
+    def destroy(self) -> None:
+        """Delete every canvas item, pooled ones included."""
+        with contextlib.suppress(tk.TclError):
+            self.canvas.delete(self.TAG)
+        self._clear_columns()
+        for pool in self._free.values():
+            pool.clear()
+
+    def _clear_columns(self) -> None:
+        for column in self._columns():
+            column.clear()
+        self.image.clear()
+        self.sparkles = []
+        self._slot = []
+        self._palette = SPRITE_PALETTES[0]
+
+
+class SparklePool:
+    """A fixed set of pre-created sparkle ovals, shown and hidden in place.
+
+    Sparkles are repositioned and toggled with `-state` instead of being
+    created and deleted, and all of them expire from the animation's frame
+    tick instead of one `after()` timer each. When every oval is in use,
+    new sparkles are skipped.
+    """
+
+    TAG = "sparkle"
+
+    def __init__(
+        self,
+        canvas: AnimationCanvas,
+        size: int = SPARKLE_POOL_SIZE,
+        lifetime: int = SPARKLE_FRAMES,
+    ) -> None:
+        self.canvas = canvas
+        self.size = size
+        self.lifetime = lifetime
+        self.ids: list[int] = []
+        self._free: list[int] = []
+        # pool slot -> frame at which it expires
+        self._expires: dict[int, int] = {}
+        self.skipped = 0
+
+    def reserve(self) -> None:
+        """Create the pool's items up front."""
+        if self.ids:
+            return
+        self.ids = [
+            self.canvas.create_oval(
+                0, 0, 0, 0, fill="#FFFFFF", outline="", state="hidden", tags=(self.TAG,)
+            )
+            for _ in range(self.size)
+        ]
+        self._free = list(range(self.size))
+
+    def emit(self, points: list[tuple[float, float, float]], frame: int) -> None:
+        """Show a sparkle of radius r at each (x, y, r), expire old ones."""
+        self.reserve()
+        path = str(self.canvas)
+        updates: list[str] = []
+
+        for slot, expires in list(self._expires.items()):
+            if expires <= frame:
+                del self._expires[slot]
+                self._free.append(slot)
+                updates.append(f"{path} itemconfigure {self.ids[slot]} -state hidden")
+
+        for sx, sy, sz in points:
+            if not self._free:
+                self.skipped += 1
+                continue
+            slot = self._free.pop()
+            self._expires[slot] = frame + self.lifetime
+            item = self.ids[slot]
+            updates.append(
+                f"{path} coords {item}"
+                f" {sx - sz:.1f} {sy - sz:.1f} {sx + sz:.1f} {sy + sz:.1f}"
+            )
+            updates.append(f"{path} itemconfigure {item} -state normal")
+        if updates:
+            # keep sparkles above the confetti
+            updates.append(f"{path} raise {self.TAG}")
+        _push_coords(self.canvas, updates)
+
+    def hide_all(self) -> None:
+        if self.ids:
+            with contextlib.suppress(tk.TclError):
+                self.canvas.itemconfigure(self.TAG, state="hidden")
+        self._free = list(range(len(self.ids)))
+        self._expires.clear()
+
+
+@dataclass
+class ConfettiOptions:
+    count: int = CONFETTI_COUNT
+    sparkle_pool_size: int = SPARKLE_POOL_SIZE
+    # Draw the confetti from a pre-rendered `SpriteAtlas`. Only worth it for
+    # large counts: at the default count the polygon mode is cheaper (see
+    # `super_ctf.gui.sprites`).
+    use_sprites: bool = False
+    # reproducible bursts (and so whole runs)
+    seed: int | None = None
+    # per-frame Tcl round-trip accounting, see `TclCallCounter`
+    count_tcl_calls: bool = False
 
 
 class ConffetiAnimation:
     def __init__(
         self,
-        parent_app: tk.Tk,
+        parent_app: tk.Tk | None,
         width: int = CanvasSettings.WIDTH,
         height: int = CanvasSettings.HEIGHT,
-        confetti_count: int = CONFETTI_COUNT,
+        canvas: AnimationCanvas | None = None,
+        options: ConfettiOptions | None = None,
     ) -> None:
-        self.parent_app: tk.Tk = parent_app
+        """Pass `canvas` (e.g. a `RecordingCanvas`) to draw on it instead of a
+        new Tk canvas.
+        """
+        options = options or ConfettiOptions()
+        self.parent_app = parent_app
         self.width = width
         self.height = height
-        self.canvas = tk.Canvas(parent_app, width=width, height=height, bg=CanvasSettings.BG_COLOR, highlightthickness=0)
-        self.canvas.pack(fill="both", expand=True)
-        tk.Widget.lift(self.canvas)
-
-        self.confetti_count = confetti_count
-        self.particles: list[Particle] = []
+        if canvas is None:
+            tk_canvas = tk.Canvas(
+                parent_app,
+                width=width,
+                height=height,
+                bg=CanvasSettings.BG_COLOR,
+                highlightthickness=0,
+            )
+            tk_canvas.pack(fill="both", expand=True)
+            tk.Widget.lift(tk_canvas)
+            canvas = tk_canvas
+        self.canvas: AnimationCanvas = canvas
+        # Optional per-frame Tcl round-trip accounting
+        self.tcl_calls: TclCallCounter | None = (
+            TclCallCounter.attach(self.canvas) if options.count_tcl_calls else None
+        )
+
+        self.confetti_count = options.count
+        self.rng = random.Random(options.seed)
+        self.sprites = SpriteAtlas(self.canvas) if options.use_sprites else None
+        if self.sprites is not None:
+            # full-colour sprites up front, like the items below; the faded
+            # ones are rendered during a run, and only if it reaches the fade
+            self.sprites.prerender(SPRITE_PALETTES[0], SPRITE_SIZES)
+        # frame from which `render()` renders queued faded sprites, if any
+        self._fade_sprites_at: int | None = None
+        self.particles = ParticleField(self.canvas, sprites=self.sprites)
+        # Pre-create items (about half of each shape plus headroom) so the
+        # first celebration does not stall on item creation.
+        self.particles.reserve(options.count // 2 + options.count // 8)
+        self.sparkles = SparklePool(self.canvas, size=options.sparkle_pool_size)
+        self.sparkles.reserve()
         self.running = False
         self.frame = 0
+        self._bounds = (width, height)
         # Ensure the animation runs only once unless explicitly reset
         self.played_once = False
 
-    def _get_size(self) -> Tuple[int, int]:
+        self.clock = FrameClock(self.canvas, self.step, self.render, step_ms=FRAME_MS)
+        self.clock.on_finish = self._finish
+
+    def _get_size(self) -> tuple[int, int]:
         self.canvas.update_idletasks()
-        w = self.canvas.winfo_width() or self.width
-        h = self.canvas.winfo_height() or self.height
-        return w, h
+        w = self.canvas.winfo_width()
+        h = self.canvas.winfo_height()
+        # an unmapped canvas reports 1x1
+        return (w if w > 1 else self.width), (h if h > 1 else self.height)
 
     def create(self) -> None:
-        # Emit across the full width from near the top so confetti fills the whole screen
+        # Emit across the full width from near the top so confetti fills the
+        # whole screen
         w, h = self._get_size()
-        self.particles = []
-        for _ in range(self.confetti_count):
-            x = random.uniform(0, w)
-            y = random.uniform(-40, 30)  # slightly above the visible area
-            p = Particle(self.canvas, x, y)
-            self.particles.append(p)
+        self._bounds = (w, h)
+        self.particles.spawn(BurstPlan.draw(self.rng, self.confetti_count, w))
         self.frame = 0
-
-    def animate(self, frames: int = TOTAL_FRAMES) -> None:
-        if not self.running:
-            return
-
-        for p in list(self.particles):
-            p.update(self.frame)
+        self._fade_sprites_at = None
+        if self.sprites is not None and self.particles.exit_frame(h) >= FADE_START:
+            # already rendered sprites are not queued again
+            for palette in SPRITE_PALETTES[1:]:
+                self.sprites.schedule(palette, SPRITE_SIZES)
+            self._fade_sprites_at = max(0, FADE_START - FADE_LEAD_FRAMES)
+
+    def step(self) -> bool:
+        """Advance the physics by one fixed step; False once the animation is over,
+        which is early if every particle has left the canvas.
+        """
+        if self.frame > TOTAL_FRAMES or not self.particles:
+            return False
+        self.particles.step(self.frame, *self._bounds)
+        self.frame += 1
+        return True
+
+    def render(self) -> None:
+        frame = self.frame - 1
+        self.particles.render()
+        fade_at = self._fade_sprites_at
+        if (
+            fade_at is not None
+            and frame >= fade_at
+            and self.sprites is not None
+            and not self.sprites.work(SPRITE_RENDERS_PER_FRAME)
+        ):
+            self._fade_sprites_at = None
+        p = self.particles
+        self.sparkles.emit(
+            [
+                (p.x[i], p.y[i], max(1.0, p.size[i] * 0.2))
+                for i in p.sparkle_candidates(frame)
+            ],
+            frame,
+        )
 
         # start fading near the end
-        if self.frame >= FADE_START:
-            fade_factor = max(0.0, 1.0 - (self.frame - FADE_START) / max(1, (TOTAL_FRAMES - FADE_START)))
-            for p in self.particles:
-                p.fade(fade_factor)
+        if frame >= FADE_START:
+            self.particles.fade(frame - FADE_START)
 
-        self.frame += 1
+        if self.tcl_calls is not None:
+            self.tcl_calls.end_frame()
 
-        if frames > 0:
-            self.parent_app.after(20, lambda: self.animate(frames - 1))
-        else:
-            self.running = False
-            # cleanup
-            for p in self.particles:
-                try:
-                    self.canvas.delete(p.id)
-                except Exception:
-                    pass
-            self.particles = []
-            # mark that we've played once
-            self.played_once = True
+    def _finish(self) -> None:
+        self.running = False
+        # cleanup
+        self.particles.clear()
+        self.sparkles.hide_all()
+        # mark that we've played once
+        self.played_once = True
 
     def start(self) -> None:
         # ensure canvas fills parent and then emit across it
@@ -226,15 +701,13 @@ class ConffetiAnimation:
 
         self.create()
         self.running = True
-        self.animate()
+        self.clock.start()
 
     def reset(self) -> None:
         """Allow the animation to be played again."""
+        self.clock.stop()
+        self.running = False
         # cleanup any remaining particles
-        for p in list(self.particles):
-            try:
-                self.canvas.delete(p.id)
-            except Exception:
-                pass
-        self.particles = []
+        self.particles.clear()
+        self.sparkles.hide_all()
         self.played_once = False
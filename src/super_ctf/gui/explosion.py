@@ -15,127 +15,277 @@ from __future__ import annotations
 import contextlib
 import random
 import tkinter as tk
+from typing import TYPE_CHECKING
 
 from super_ctf.gui import CanvasSettings
+from super_ctf.gui.clock import FrameClock
 
+if TYPE_CHECKING:
+    from super_ctf.gui.canvas import AnimationCanvas
 
-class _Debris:
-    def __init__(self, canvas: tk.Canvas, x: float, y: float) -> None:
+FRAME_MS = 24
+TOTAL_FRAMES = 200
+
+
+DEBRIS_COLORS = ("#222222", "#444444", "#111111", "#ff5500")
+DEBRIS_GRAVITY = 0.6
+OFFSCREEN_MARGIN = 50
+DEFAULT_DEBRIS = 160
+
+
+class DebrisField:
+    """Debris pieces stored as parallel arrays.
+
+    Off-screen pieces are removed by compacting the arrays in a single pass
+    per frame, so removal is linear in the number of pieces however many
+    leave the screen at once. Their canvas items are hidden and pooled (in
+    one Tcl call) rather than deleted, and re-seeded by the next `spawn()`.
+    """
+
+    TAG = "debris"
+
+    def __init__(self, canvas: AnimationCanvas) -> None:
         self.canvas = canvas
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-12, 12)
-        self.vy = random.uniform(-12, 12)
-        self.size = random.uniform(2.5, 8.0)
-        self.rotation = random.uniform(0, 360)
-        self.color = random.choice(["#222222", "#444444", "#111111", "#ff5500"])
-        self.id = canvas.create_rectangle(
-            x, y, x + self.size, y + self.size, fill=self.color, outline=""
+        self._free: list[int] = []
+        self.ids: list[int] = []
+        self.x: list[float] = []
+        self.y: list[float] = []
+        self.vx: list[float] = []
+        self.vy: list[float] = []
+        self.size: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def reserve(self, count: int) -> None:
+        """Pre-create hidden items so a later `spawn()` allocates nothing."""
+        missing = count - len(self._free) - len(self.ids)
+        self._free.extend(
+            self.canvas.create_rectangle(
+                0, 0, 0, 0, outline="", state="hidden", tags=(self.TAG,)
+            )
+            for _ in range(max(0, missing))
         )
 
-    def update(self) -> None:
-        self.vy += 0.6  # gravity
-        self.x += self.vx
-        self.y += self.vy
-        self.canvas.move(self.id, self.vx, self.vy)
+    def spawn(
+        self, count: int, cx: float, cy: float, rng: random.Random | None = None
+    ) -> None:
+        rng = rng or random.Random()
+        self.clear()
+        self.reserve(count)
+        path = str(self.canvas)
+        updates: list[str] = []
+        for _ in range(count):
+            x = cx + rng.uniform(-10, 10)
+            y = cy + rng.uniform(-10, 10)
+            size = rng.uniform(2.5, 8.0)
+            self.x.append(x)
+            self.y.append(y)
+            self.vx.append(rng.uniform(-12, 12))
+            self.vy.append(rng.uniform(-12, 12))
+            self.size.append(size)
+            item = self._free.pop()
+            self.ids.append(item)
+            updates.append(
+                f"{path} coords {item} {x:.1f} {y:.1f} {x + size:.1f} {y + size:.1f}"
+            )
+            color = rng.choice(DEBRIS_COLORS)
+            updates.append(f"{path} itemconfigure {item} -fill {color} -state normal")
+        # re-seed every item in one Tcl round trip
+        self.canvas.tk.eval("\n".join(updates))
+
+    def step(self, width: float, height: float) -> None:
+        """Advance every piece and drop the ones that left the canvas."""
+        ids, x, y, vx, vy, size = self.ids, self.x, self.y, self.vx, self.vy, self.size
+        right = width + OFFSCREEN_MARGIN
+        bottom = height + OFFSCREEN_MARGIN
+        dead: list[int] = []
+        keep = 0
+        for i in range(len(ids)):
+            vy[i] += DEBRIS_GRAVITY
+            x[i] += vx[i]
+            y[i] += vy[i]
+            if y[i] > bottom or x[i] < -OFFSCREEN_MARGIN or x[i] > right:
+                dead.append(ids[i])
+                continue
+            if keep != i:
+                ids[keep], x[keep], y[keep] = ids[i], x[i], y[i]
+                vx[keep], vy[keep], size[keep] = vx[i], vy[i], size[i]
+            keep += 1
+
+        if dead:
+            for column in (ids, x, y, vx, vy, size):
+                del column[keep:]
+            self._release(dead)
+
+    def render(self) -> None:
+        # one Tcl round trip for all debris positions
+        path = str(self.canvas)
+        script = "\n".join(
+            f"{path} coords {item} {x:.1f} {y:.1f} {x + s:.1f} {y + s:.1f}"
+            for item, x, y, s in zip(self.ids, self.x, self.y, self.size, strict=True)
+        )
+        if script:
+            self.canvas.tk.eval(script)
+
+    def _release(self, items: list[int]) -> None:
+        path = str(self.canvas)
+        with contextlib.suppress(tk.TclError):
+            self.canvas.tk.eval(
+                "\n".join(f"{path} itemconfigure {i} -state hidden" for i in items)
+            )
+        self._free.extend(items)
+
+    def clear(self) -> None:
+        """Hide every live piece and return its item to the pool."""
+        if self.ids:
+            with contextlib.suppress(tk.TclError):
+                self.canvas.itemconfigure(self.TAG, state="hidden")
+            self._free.extend(self.ids)
+        for column in (self.ids, self.x, self.y, self.vx, self.vy, self.size):
+            column.clear()
 
 
 class ExplosionAnimation:
-    def __init__(self, parent: tk.Tk | tk.Toplevel):
+    def __init__(
+        self,
+        parent: tk.Tk | tk.Toplevel | None,
+        canvas: AnimationCanvas | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Pass `canvas` (e.g. a `RecordingCanvas`) to draw on it instead of a
+        new Tk canvas.
+
+        With a `seed`, the debris (and so whole runs) are reproducible.
+        """
         self.parent = parent
+        self.rng = random.Random(seed)
         self.width = CanvasSettings.WIDTH
         self.height = CanvasSettings.HEIGHT
 
-        self.canvas = tk.Canvas(
-            parent,
-            width=self.width,
-            height=self.height,
-            bg="black",
-            highlightthickness=0,
+        if canvas is None:
+            tk_canvas = tk.Canvas(
+                parent,
+                width=self.width,
+                height=self.height,
+                bg="black",
+                highlightthickness=0,
+            )
+            tk_canvas.place(x=0, y=0)
+            canvas = tk_canvas
+        self.canvas: AnimationCanvas = canvas
+        self.debris = DebrisField(self.canvas)
+        self.debris.reserve(DEFAULT_DEBRIS)
+        self._flash_item = self.canvas.create_rectangle(
+            0, 0, self.width, self.height, fill="white", state="hidden"
         )
-        self.canvas.place(x=0, y=0)
-        self.debris: list[_Debris] = []
         self.running = False
+        self.frame = 0
+
+        self.clock = FrameClock(self.canvas, self._step, self._render, step_ms=FRAME_MS)
+        self.clock.on_finish = self._finish
 
     def _center(self) -> tuple[float, float]:
         self.canvas.update_idletasks()
         return (self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2)
 
     def _flash(self) -> None:
-        # brief fullscreen flash
-        rect = self.canvas.create_rectangle(0, 0, self.width, self.height, fill="white")
-        self.parent.after(80, lambda: self.canvas.delete(rect))
+        # brief fullscreen flash, reusing one hidden rectangle
+        self.canvas.itemconfigure(self._flash_item, state="normal")
+        self.canvas.tag_raise(self._flash_item)
+        self.canvas.after(
+            80, lambda: self.canvas.itemconfigure(self._flash_item, state="hidden")
+        )
 
-    def _spawn_debris(self, count: int = 120) -> None:
+    def _spawn_debris(self, count: int = DEFAULT_DEBRIS) -> None:
         cx, cy = self._center()
-        self.debris = [
-            _Debris(
-                self.canvas, cx + random.uniform(-10, 10), cy + random.uniform(-10, 10)
-            )
-            for _ in range(count)
-        ]
+        self.debris.spawn(count, cx, cy, self.rng)
 
-    def _update(self, frames: int = 200) -> None:
-        if frames <= 0:
-            self.running = False
-            return
+    def _step(self) -> bool:
+        # stop as soon as every piece has left the screen
+        if self.frame >= TOTAL_FRAMES or not self.debris:
+            return False
+        self.frame += 1
+        self.debris.step(self.width, self.height)
+        return True
 
-        for d in list(self.debris):
-            d.update()
-            # fade tiny pieces by shrinking
-            if d.y > self.height + 50 or d.x < -50 or d.x > self.width + 50:
-                with contextlib.suppress(Exception):
-                    self.canvas.delete(d.id)
-                with contextlib.suppress(ValueError):
-                    self.debris.remove(d)
+    def _render(self) -> None:
+        self.debris.render()
+
+    def _finish(self) -> None:
+        self.running = False
+        self.debris.clear()
 
-        # schedule next frame
-        self.parent.after(24, lambda: self._update(frames - 1))
+    def finish(self) -> None:
+        """Stop a running animation now and hide its debris."""
+        self.clock.stop()
+        self._finish()
 
-    def trigger(self, debris: int = 160) -> None:
+    def trigger(self, debris: int = DEFAULT_DEBRIS) -> None:
         if self.running:
             return
         self.running = True
         # flash then spawn debris
         self._flash()
         self._spawn_debris(count=debris)
-        self._update()
+        self.frame = 0
+        self.clock.start()
 
 
 class ExplosionOverlay:
     """A convenience overlay window that covers the parent and runs the
-    explosion animation. The overlay is a transient Toplevel that will be
-    destroyed after the animation finishes.
+    explosion animation. The Toplevel and its canvas items are created once
+    and kept withdrawn between runs, so repeated triggers reuse them; call
+    `destroy()` when the overlay is no longer needed.
     """
 
-    def __init__(self, parent: tk.Tk | tk.Toplevel):
+    def __init__(self, parent: tk.Tk | tk.Toplevel) -> None:
         self.parent = parent
-        # Create a fullscreen/parent-covering Toplevel
+        # Create a parent-covering Toplevel, hidden until triggered
         self.win = tk.Toplevel(parent)
+        self.win.withdraw()
         self.win.overrideredirect(True)
         self.win.attributes("-topmost", True)
+        self.win.configure(bg="black")
+        self._hide_id: str | None = None
+
+        self.anim = ExplosionAnimation(self.win)
+
+    def _cover_parent(self) -> None:
         # place over the parent window
         try:
-            x = parent.winfo_rootx()
-            y = parent.winfo_rooty()
-            w = parent.winfo_width()
-            h = parent.winfo_height()
-        except Exception:
+            x = self.parent.winfo_rootx()
+            y = self.parent.winfo_rooty()
+            w = self.parent.winfo_width()
+            h = self.parent.winfo_height()
+        except Exception:  # noqa: BLE001
             x = y = 0
             w = CanvasSettings.WIDTH
             h = CanvasSettings.HEIGHT
-
         self.win.geometry(f"{w}x{h}+{x}+{y}")
-        self.win.configure(bg="black")
 
-        self.anim = ExplosionAnimation(self.win)
+    def _hide(self) -> None:
+        self._hide_id = None
+        self.anim.finish()
+        self.win.withdraw()
 
-    def trigger(self, debris: int = 160, duration_ms: int = 6000) -> None:
-        # Play animation and schedule destroy
+    def trigger(self, debris: int = DEFAULT_DEBRIS, duration_ms: int = 6000) -> None:
+        # Show the overlay, play the animation and schedule hiding it again
+        if self._hide_id is not None:
+            self.win.after_cancel(self._hide_id)
+        self._cover_parent()
+        self.win.deiconify()
+        self.win.lift()
         self.anim.trigger(debris=debris)
 
-        # Destroy overlay after duration
-        self.win.after(duration_ms, self.win.destroy)
+        self._hide_id = self.win.after(duration_ms, self._hide)
+
+    def destroy(self) -> None:
+        if self._hide_id is not None:
+            self.win.after_cancel(self._hide_id)
+            self._hide_id = None
+        self.anim.clock.stop()
+        self.win.destroy()
 
 
 __all__ = ["ExplosionAnimation", "ExplosionOverlay"]
@@ -0,0 +1,71 @@
+"""Instrumentation for the Tk animations.
+
+`TclCallCounter.attach(canvas)` swaps the canvas' Tcl interpreter handle for
+a counting proxy. Every Tkinter canvas method goes through `canvas.tk.call`
+(or `eval` for batched scripts), so the counter sees each Tcl round trip the
+animation makes. Call `end_frame()` once per frame to get per-frame counts.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import tkinter as tk
+
+    from super_ctf.gui.canvas import AnimationCanvas
+
+
+class _CountingTcl:
+    def __init__(self, tcl: Any, counter: TclCallCounter) -> None:  # noqa: ANN401
+        self._tcl = tcl
+        self._counter = counter
+
+    def call(self, *args: Any) -> Any:  # noqa: ANN401
+        self._counter.record(args)
+        return self._tcl.call(*args)
+
+    def eval(self, script: str) -> Any:  # noqa: ANN401
+        self._counter.record(("eval",), commands=script.count("\n") + 1)
+        return self._tcl.eval(script)
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        return getattr(self._tcl, name)
+
+
+class TclCallCounter:
+    def __init__(self) -> None:
+        self.total = 0
+        # Tcl commands executed, counting each line of a batched eval.
+        self.commands = 0
+        self.by_command: Counter[str] = Counter()
+        self.frames: list[int] = []
+        self._frame_start = 0
+
+    @classmethod
+    def attach(cls, canvas: tk.Canvas | AnimationCanvas) -> TclCallCounter:
+        counter = cls()
+        canvas.tk = _CountingTcl(canvas.tk, counter)  # pyright: ignore[reportAttributeAccessIssue]
+        return counter
+
+    def record(self, args: tuple[Any, ...], commands: int = 1) -> None:
+        self.total += 1
+        self.commands += commands
+        # Widget commands look like (".!canvas", "coords", ...).
+        name = args[1] if len(args) > 1 and str(args[0]).startswith(".") else args[0]
+        self.by_command[str(name)] += 1
+
+    def end_frame(self) -> int:
+        """Close the current frame and return its number of Tcl calls."""
+        calls = self.total - self._frame_start
+        self._frame_start = self.total
+        self.frames.append(calls)
+        return calls
+
+    @property
+    def mean_per_frame(self) -> float:
+        return sum(self.frames) / len(self.frames) if self.frames else 0.0
+
+
+__all__ = ["TclCallCounter"]
@@ -0,0 +1,184 @@
+"""Pre-rendered confetti sprites.
+
+`SpriteAtlas` rasterises each (colour, shape, size, rotation bucket)
+combination once into a Tk photo image and hands out its name, so a
+particle drawn with `create_image` only needs its position updated each
+frame, plus an `-image` switch when its rotation bucket changes.
+
+Sprites are encoded as RGBA PNGs with the standard library and created with
+`image create photo` through the canvas' Tcl interpreter (in batches, one
+round trip each), which also works on a `RecordingCanvas`.
+
+Sprites do not pay off at the default `CONFETTI_COUNT`: per particle and
+frame they save a rotation and a longer coords command, but every frame
+also looks up each particle's sprite and, once faded sprites are due,
+renders a few of them, and at 260 particles those fixed costs dominate (the
+polygon mode then measures about a third less CPU per frame). From about a
+thousand particles on the saving per particle wins, by about a third at
+ten times the default count; `super_ctf.bench.animations` has both cases.
+"""
+
+from __future__ import annotations
+
+import base64
+import itertools
+import math
+import struct
+import zlib
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from super_ctf.gui.canvas import AnimationCanvas
+
+ROTATION_BUCKETS = 12  # over 180 degrees: a rectangle looks the same rotated by 180
+
+
+def encode_png(width: int, height: int, rgba: bytes) -> str:
+    """Return base64 PNG data for `width` x `height` RGBA pixels."""
+    stride = width * 4
+    # filter type 0 (None) for every scanline
+    raw = b"".join(b"\x00" + rgba[y * stride : (y + 1) * stride] for y in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        crc = zlib.crc32(kind + data)
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+    return base64.b64encode(png).decode("ascii")
+
+
+def _rgba(color: str) -> bytes:
+    return bytes.fromhex(color.lstrip("#")) + b"\xff"
+
+
+def rect_png(color: str, hw: float, hh: float, angle: float) -> str:
+    """A `2*hw` x `2*hh` rectangle rotated by `angle` degrees, centred."""
+    side = math.ceil(2 * math.hypot(hw, hh)) + 1
+    c = side / 2
+    rad = math.radians(angle)
+    cos_a, sin_a = math.cos(rad), math.sin(rad)
+    fill, clear = _rgba(color), b"\x00\x00\x00\x00"
+    pixels = bytearray()
+    for py in range(side):
+        dy = py + 0.5 - c
+        for px in range(side):
+            dx = px + 0.5 - c
+            # rotate the pixel centre back into the rectangle's frame
+            u = dx * cos_a + dy * sin_a
+            v = -dx * sin_a + dy * cos_a
+            pixels += fill if abs(u) <= hw and abs(v) <= hh else clear
+    return encode_png(side, side, bytes(pixels))
+
+
+def disc_png(color: str, r: float) -> str:
+    side = math.ceil(2 * r) + 1
+    c = side / 2
+    fill, clear = _rgba(color), b"\x00\x00\x00\x00"
+    pixels = bytearray()
+    for py in range(side):
+        for px in range(side):
+            inside = (px + 0.5 - c) ** 2 + (py + 0.5 - c) ** 2 <= r * r
+            pixels += fill if inside else clear
+    return encode_png(side, side, bytes(pixels))
+
+
+class SpriteAtlas:
+    # (colour, "rect" or "disc", size, rotation bucket)
+    Key = tuple[str, str, float, int]
+
+    _atlases = itertools.count(1)
+
+    def __init__(
+        self, canvas: AnimationCanvas, buckets: int = ROTATION_BUCKETS
+    ) -> None:
+        self.canvas = canvas
+        self.buckets = buckets
+        self._bucket_deg = 180 / buckets
+        self._prefix = f"sprite{next(self._atlases)}-"
+        self._images: dict[SpriteAtlas.Key, str] = {}
+        # sprites still to render, see `schedule()`
+        self._pending: deque[SpriteAtlas.Key] = deque()
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def bucket(self, angle: float) -> int:
+        return int((angle % 180) / self._bucket_deg) % self.buckets
+
+    def _data(self, key: Key) -> str:
+        color, shape, size, bucket = key
+        if shape == "disc":
+            return disc_png(color, size / 2)
+        # confetti rectangles are 1.4 x 0.8 `size`, drawn at the bucket's
+        # centre angle
+        angle = (bucket + 0.5) * self._bucket_deg
+        return rect_png(color, size * 0.7, size * 0.4, angle)
+
+    def _command(self, key: Key) -> str:
+        """Register the image name for `key`; return the Tcl command creating it."""
+        name = self._images[key] = f"{self._prefix}{len(self._images)}"
+        return f"image create photo {name} -format png -data {self._data(key)}"
+
+    def _get(self, key: Key) -> str:
+        name = self._images.get(key)
+        if name is None:
+            self.canvas.tk.eval(self._command(key))
+            name = self._images[key]
+        return name
+
+    def rect(self, color: str, size: float, angle: float) -> str:
+        """Image name of a confetti rectangle of `size` at `angle`."""
+        return self._get((color, "rect", size, self.bucket(angle)))
+
+    def disc(self, color: str, size: float) -> str:
+        return self._get((color, "disc", size, 0))
+
+    def _keys(self, colors: list[str], sizes: tuple[float, ...]) -> list[Key]:
+        return [
+            key
+            for color in colors
+            for size in sizes
+            for key in [
+                (color, "disc", size, 0),
+                *((color, "rect", size, bucket) for bucket in range(self.buckets)),
+            ]
+        ]
+
+    def _create_batch(self, keys: Iterable[Key]) -> None:
+        # one Tcl round trip for the whole batch
+        script = [self._command(key) for key in keys if key not in self._images]
+        if script:
+            self.canvas.tk.eval("\n".join(script))
+
+    def prerender(self, colors: list[str], sizes: tuple[float, ...]) -> None:
+        """Render every sprite for `colors` and `sizes` now."""
+        self._create_batch(self._keys(colors, sizes))
+
+    def schedule(self, colors: list[str], sizes: tuple[float, ...]) -> None:
+        """Queue the sprites for `colors` and `sizes`; `work()` renders them."""
+        self._pending.extend(
+            key for key in self._keys(colors, sizes) if key not in self._images
+        )
+
+    def work(self, limit: int) -> int:
+        """Render up to `limit` queued sprites; return how many are left."""
+        pending = self._pending
+        self._create_batch([pending.popleft() for _ in range(min(limit, len(pending)))])
+        return len(pending)
+
+    def destroy(self) -> None:
+        if self._images:
+            self.canvas.tk.call("image", "delete", *self._images.values())
+            self._images.clear()
+        self._pending.clear()
+
+
+__all__ = ["ROTATION_BUCKETS", "SpriteAtlas", "disc_png", "encode_png", "rect_png"]
@@ -1,16 +1,65 @@
+from __future__ import annotations
+
+import math
+import time
 import tkinter as tk
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from super_ctf.diff import StatusDelta
 
 from . import CanvasSettings
+from .channel import UiChannel
 from .confetti import ConffetiAnimation
 from .explosion import ExplosionOverlay
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from super_ctf.watcher import Status
+
+MISSIONS = 2
+DRAIN_MS = 100  # how often watcher events are applied to the UI
+
 
 class Countdown:
-    def __init__(self, seconds_to_count: int):
+    def __init__(
+        self,
+        seconds_to_count: int,
+        score: Callable[[Status], int] | None = None,
+        master: tk.Misc | None = None,
+        now: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """`score(status)` returns the number of missions `status` completes.
+        With a `master`, the countdown opens in a `Toplevel` of its Tk loop.
+
+        The countdown runs off a `now()` deadline: each tick is scheduled for
+        the next second boundary and recomputes the remaining time, so late
+        callbacks never add up and a stall is caught up on the next tick.
+        `max_drift` is the worst lateness of a tick past its boundary (s).
+
+        Watcher threads must not touch the widgets: they post `Status` or
+        `StatusDelta` events to `self.channel`, which the Tk thread drains
+        every `DRAIN_MS`. A watcher that only posts changes sets `on_resync`
+        (e.g. to `StatusDiffer.request_snapshot`): it is called from the Tk
+        thread, through `request_resync()`, whenever the window is mapped
+        again, and should make the watcher post a full snapshot at its next
+        probe.
+        """
         self.time: int = seconds_to_count
         self.remaining_time: int = self.time
+        self.now = now
+        self._deadline = 0.0
+        # when the current tick was due, and the worst lateness so far
+        self._due = 0.0
+        self.max_drift = 0.0
+        # text currently shown by each label, to skip no-op reconfigures
+        self._shown: dict[tk.Label, str] = {}
 
-        self.window = tk.Tk()
+        self.window: tk.Tk | tk.Toplevel = (
+            tk.Tk() if master is None else tk.Toplevel(master)
+        )
         self.window.geometry(f"{CanvasSettings.WIDTH}x{CanvasSettings.HEIGHT}")
         self.window.resizable(False, False)
         self.window.configure(bg=CanvasSettings.BG_COLOR)
@@ -35,32 +84,88 @@ class Countdown:
         )
         self.missions_label.place(x=12, y=12)
         self.missions_compelete = 0
+        self.completed = False
+        self.score = score
+        self.channel: UiChannel[Status | StatusDelta] = UiChannel()
+        self.on_resync: Callable[[], None] | None = None
+        self.window.bind("<Map>", self._on_map, add="+")
 
         self.conffeti = ConffetiAnimation(self.window)
+        # created up front (hidden) so a failure reuses its window and items
+        self.explosion = ExplosionOverlay(self.window)
+
+    def _set_text(self, label: tk.Label, text: str) -> None:
+        if self._shown.get(label) != text:
+            self._shown[label] = text
+            label.config(text=text)
+
+    def request_resync(self) -> None:
+        """Ask the watcher for a full snapshot and repaint it, even if unchanged."""
+        self._shown.pop(self.missions_label, None)
+        if self.on_resync is not None:
+            self.on_resync()
+
+    def _on_map(self, event: tk.Event) -> None:
+        # <Map> bound on the window also fires for each of its children
+        if event.widget is self.window:
+            self.request_resync()
 
     def _update_display(self, current_time: int, missions_complete: int):
         mins, secs = divmod(current_time, 60)
-        time_str = f"{mins:02d}:{secs:02d}"
-        self.timer_label.config(text=time_str)
-        self.missions_label.config(text=f"{missions_complete}/2")
+        self._set_text(self.timer_label, f"{mins:02d}:{secs:02d}")
+        self._set_text(self.missions_label, f"{missions_complete}/{MISSIONS}")
+
+    def _drain(self) -> None:
+        events = self.channel.drain()
+        if events and self.score is not None and not self.completed:
+            # only the newest snapshot matters: one repaint per tick
+            last = events[-1]
+            self._apply(last.status if isinstance(last, StatusDelta) else last)
+        self.window.after(DRAIN_MS, self._drain)
+
+    def _apply(self, status: Status) -> None:
+        assert self.score is not None  # noqa: S101
+        result = self.score(status)
+        if result >= MISSIONS:
+            self.completed = True
+            self.timer_label.destroy()
+            self.conffeti.start()
+            logger.debug(f"UI channel: {self.channel.stats()}")
+            logger.debug(f"Countdown max drift: {self.max_drift * 1000:.1f} ms")
+            return
+        self.missions_compelete = result
+        self._set_text(self.missions_label, f"{result}/{MISSIONS}")
+
+    def _schedule_tick(self, now: float) -> None:
+        # the next boundary is when the remaining whole seconds drop by one
+        self._due = self._deadline - (self.remaining_time - 1)
+        self.window.after(max(0, math.ceil((self._due - now) * 1000)), self._count)
 
     def _count(self):
+        if self.completed:
+            return
+        now = self.now()
+        self.max_drift = max(self.max_drift, now - self._due)
+        self.remaining_time = max(0, math.ceil(self._deadline - now))
         if self.remaining_time > 0:
-            self.remaining_time -= 1
             self._update_display(self.remaining_time, self.missions_compelete)
-            self.window.after(1000, self._count)
+            self._schedule_tick(now)
         else:
             # User has failed to complete in time!
             self._update_display(0, self.missions_compelete)
+            logger.debug(f"Countdown max drift: {self.max_drift * 1000:.1f} ms")
             self.timer_label.config(foreground="#ff5e5e")
             # Show dramatic explosion overlay to indicate failure
             try:
                 # schedule on mainloop to avoid re-entrancy issues
-                self.window.after(0, lambda: ExplosionOverlay(self.window).trigger())
+                self.window.after(0, self.explosion.trigger)
             except Exception:
                 # best-effort; don't crash the UI if overlay can't be created
                 pass
 
     def start(self):
+        now = self.now()
+        self._deadline = now + self.remaining_time
         self._update_display(self.remaining_time, self.missions_compelete)
-        self.window.after(1000, self._count)
+        self._schedule_tick(now)
+        self.window.after(DRAIN_MS, self._drain)
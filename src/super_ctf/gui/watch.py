@@ -0,0 +1,120 @@
+"""Drive the watcher from the Tk event loop, without a thread of its own.
+
+`TkWatcher` runs the probes of a `ProbeBatch` from `after()` callbacks:
+
+- each cycle submits every probe call on its own to the executor shared by
+  every batch in the process (`super_ctf.probes.shared_executor()`), so no
+  thread is parked waiting for the others;
+- an `after()` tick checks the pending calls every `poll_ms`, and once they
+  are done, or the batch's timeout is up, collects the snapshot on the Tk
+  thread, so `on_status` may touch widgets directly;
+- the next cycle is scheduled after the interval chosen by an
+  `AdaptivePoller`, as in `super_ctf.aio`.
+
+Several countdown windows can therefore share one Tk loop and one small
+probe executor. Change notifications are not used: they block the thread
+that waits on them.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+import tkinter as tk
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from super_ctf.pacing import AdaptivePoller
+from super_ctf.persistency.task import TASK_NAME
+from super_ctf.watcher import Status, default_probe_batch
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from super_ctf.pacing import PollPolicy
+    from super_ctf.probes import ProbeBatch
+
+POLL_MS = 50  # how often pending probes are checked for completion
+
+
+class TkWatcher:
+    poll_ms = POLL_MS
+
+    def __init__(
+        self,
+        widget: tk.Misc,
+        on_status: Callable[[Status], None],
+        task_name: str = TASK_NAME,
+        probes: ProbeBatch | None = None,
+        policy: PollPolicy | None = None,
+    ) -> None:
+        """Call `on_status(status)` on the Tk thread of `widget` for each snapshot.
+
+        `probes` defaults to `default_probe_batch(task_name)`. Snapshots
+        equal to the previous one are skipped; set the `changes_only`
+        attribute to False (before `start()`) to receive every one.
+        """
+        self.widget = widget
+        self.on_status = on_status
+        self.probes = probes if probes is not None else default_probe_batch(task_name)
+        self.poller = AdaptivePoller(policy)
+        self.changes_only = True
+
+        # when the pending cycle's probes stop being waited for
+        self._deadline: float | None = None
+        self._after_id: str | None = None
+        self.running = False
+        self.snapshots = 0
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._schedule(0)
+
+    def stop(self) -> None:
+        """Stop stepping; in-flight probe calls finish on the executor."""
+        self.running = False
+        self._deadline = None
+        if self._after_id is not None:
+            with contextlib.suppress(tk.TclError):
+                self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self, delay_ms: int) -> None:
+        try:
+            self._after_id = self.widget.after(delay_ms, self._tick)
+        except tk.TclError:
+            # the widget went away (e.g. its window was destroyed)
+            self.stop()
+
+    def _tick(self) -> None:
+        self._after_id = None
+        if not self.running:
+            return
+        now = time.monotonic()
+        if self._deadline is None:
+            self.probes.submit()
+            self._deadline = now + self.probes.timeout
+            self._schedule(self.poll_ms)
+            return
+        if not self.probes.done() and now < self._deadline:
+            self._schedule(self.poll_ms)
+            return
+
+        self._deadline = None
+        try:
+            results = self.probes.collect()
+        except Exception:  # noqa: BLE001
+            logger.exception("Watcher probe failed; stopping the Tk watcher.")
+            self.stop()
+            return
+        status = Status.from_probes(results["service"], results["task"])
+        self.snapshots += 1
+        if self.poller.observe(status) or not self.changes_only:
+            self.on_status(status)
+        self._schedule(int(self.poller.interval * 1000))
+
+
+__all__ = ["POLL_MS", "TkWatcher"]
@@ -0,0 +1,71 @@
+"""Logging for the polling hot path.
+
+The watcher probes the service and the scheduled task several times a
+second, and most polls find nothing new. Code on that path logs through a
+`TransitionLog` instead of calling `logger.debug` with f-strings:
+
+- messages take loguru's `{}` arguments, so they are only formatted when a
+  sink accepts the level;
+- a message is only emitted when the state it reports under its key
+  changed, so a steady state is logged once rather than on every poll
+  (`suppressed` counts the skipped ones).
+
+`setup_logging()` installs the stderr sink with `enqueue=True`: records are
+handed to loguru's queue and written by its worker thread, so the polling
+threads never wait on the terminal.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from loguru import Logger
+
+_UNSET = object()
+
+
+class TransitionLog:
+    def __init__(self, log: Logger = logger) -> None:
+        # report the caller's location, not this module's
+        self._log = log.opt(depth=1)
+        self._last: dict[Hashable, Any] = {}
+        self.emitted = 0
+        self.suppressed = 0
+
+    def debug(self, key: Hashable, state: Hashable, message: str, *args: Any) -> bool:  # noqa: ANN401
+        """Log `message.format(*args)` at DEBUG if `state` differs from the last
+        one logged under `key`; return True if it did.
+        """
+        if self._last.get(key, _UNSET) == state:
+            self.suppressed += 1
+            return False
+        self._last[key] = state
+        self.emitted += 1
+        self._log.debug(message, *args)
+        return True
+
+    def forget(self, key: Hashable | None = None) -> None:
+        """Log the next state under `key` (or under every key) again."""
+        if key is None:
+            self._last.clear()
+        else:
+            self._last.pop(key, None)
+
+
+# shared by the persistency layer's probes
+transitions = TransitionLog()
+
+
+def setup_logging(level: str = "DEBUG", enqueue: bool = True) -> int:
+    """Replace loguru's sinks with one stderr sink; return its id."""
+    logger.remove()
+    return logger.add(sys.stderr, level=level, enqueue=enqueue)
+
+
+__all__ = ["TransitionLog", "setup_logging", "transitions"]
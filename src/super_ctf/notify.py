@@ -0,0 +1,287 @@
+"""Change notifications for the watched service and scheduled task.
+
+A `NotificationSource` blocks until something that may affect the watched
+state happens, or until a timeout expires. The watcher re-probes after every
+wake-up and only reports snapshots that actually differ, so a source is free
+to wake up spuriously.
+
+`Win32ChangeSource` combines:
+- `NotifyServiceStatusChangeW` on the service handle, for run-state changes;
+- `RegNotifyChangeKeyValue` on the service registry key tree, for the start
+  type and for the service being created or deleted;
+- `RegNotifyChangeKeyValue` on the Task Scheduler `TaskCache` tree, which is
+  rewritten whenever a task is registered, changed, enabled/disabled or
+  deleted.
+
+It talks to the Win32 API through ctypes only, so importing this module is
+safe on any platform; constructing the source raises
+`NotificationsUnavailable` where the API cannot be used.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import os
+from typing import TYPE_CHECKING, Any, Protocol
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class NotificationsUnavailable(Exception):  # noqa: N818
+    """Raised when change notifications cannot be set up on this system."""
+
+
+class NotificationSource(Protocol):
+    def wait(self, timeout: float) -> bool:
+        """Block up to `timeout` seconds; return True if woken by a notification."""
+        ...
+
+    def close(self) -> None: ...
+
+
+# === Win32 constants ===
+_HKEY_LOCAL_MACHINE = 0x80000002
+_KEY_NOTIFY = 0x0010
+_REG_NOTIFY_CHANGE_NAME = 0x1
+_REG_NOTIFY_CHANGE_LAST_SET = 0x4
+_SC_MANAGER_CONNECT = 0x0001
+_SERVICE_QUERY_STATUS = 0x0004
+_SERVICE_NOTIFY_STATUS_CHANGE = 2
+_SERVICE_NOTIFY_DELETE_PENDING = 0x200
+# STOPPED .. PAUSED plus DELETE_PENDING
+_SERVICE_NOTIFY_MASK = 0x7F | _SERVICE_NOTIFY_DELETE_PENDING
+_WAIT_OBJECT_0 = 0x0
+_WAIT_IO_COMPLETION = 0xC0
+_WAIT_TIMEOUT = 0x102
+_ERROR_SUCCESS = 0
+
+_SERVICES_KEY = r"SYSTEM\CurrentControlSet\Services"
+_TASK_CACHE_KEY = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion\Schedule\TaskCache"
+
+
+class _ServiceStatusProcess(ctypes.Structure):
+    _fields_ = (
+        ("dwServiceType", ctypes.c_uint32),
+        ("dwCurrentState", ctypes.c_uint32),
+        ("dwControlsAccepted", ctypes.c_uint32),
+        ("dwWin32ExitCode", ctypes.c_uint32),
+        ("dwServiceSpecificExitCode", ctypes.c_uint32),
+        ("dwCheckPoint", ctypes.c_uint32),
+        ("dwWaitHint", ctypes.c_uint32),
+        ("dwProcessId", ctypes.c_uint32),
+        ("dwServiceFlags", ctypes.c_uint32),
+    )
+
+
+_NotifyCallback = (
+    ctypes.WINFUNCTYPE(None, ctypes.c_void_p)  # type: ignore[attr-defined]
+    if os.name == "nt"
+    else ctypes.CFUNCTYPE(None, ctypes.c_void_p)
+)
+
+
+class _ServiceNotify(ctypes.Structure):
+    _fields_ = (
+        ("dwVersion", ctypes.c_uint32),
+        ("pfnNotifyCallback", _NotifyCallback),
+        ("pContext", ctypes.c_void_p),
+        ("dwNotificationStatus", ctypes.c_uint32),
+        ("ServiceStatus", _ServiceStatusProcess),
+        ("dwNotificationTriggered", ctypes.c_uint32),
+        ("pszServiceNames", ctypes.c_wchar_p),
+    )
+
+
+class Win32ChangeSource:
+    """Wake up on service status, service config or task registration changes.
+
+    Must be used from a single thread: service status notifications are
+    delivered as APCs to the thread that armed them, during `wait()`.
+
+    `on_service_change()` is called from `wait()` when the Services registry
+    tree changed or the service is pending deletion, i.e. whenever a cached
+    service handle may have gone stale.
+    """
+
+    def __init__(
+        self, service_name: str, on_service_change: Callable[[], None] | None = None
+    ) -> None:
+        if os.name != "nt":
+            msg = "Win32 change notifications require Windows"
+            raise NotificationsUnavailable(msg)
+
+        self.service_name = service_name
+        self.on_service_change = on_service_change
+        self._advapi32: Any = ctypes.WinDLL("advapi32", use_last_error=True)  # type: ignore[attr-defined]
+        self._kernel32: Any = ctypes.WinDLL("kernel32", use_last_error=True)  # type: ignore[attr-defined]
+        self._advapi32.OpenSCManagerW.restype = ctypes.c_void_p
+        self._advapi32.OpenServiceW.restype = ctypes.c_void_p
+        self._advapi32.OpenServiceW.argtypes = (
+            ctypes.c_void_p,
+            ctypes.c_wchar_p,
+            ctypes.c_uint32,
+        )
+        self._advapi32.CloseServiceHandle.argtypes = (ctypes.c_void_p,)
+        self._advapi32.NotifyServiceStatusChangeW.argtypes = (
+            ctypes.c_void_p,
+            ctypes.c_uint32,
+            ctypes.POINTER(_ServiceNotify),
+        )
+        self._kernel32.CreateEventW.restype = ctypes.c_void_p
+        self._kernel32.WaitForMultipleObjectsEx.argtypes = (
+            ctypes.c_uint32,
+            ctypes.POINTER(ctypes.c_void_p),
+            ctypes.c_int,
+            ctypes.c_uint32,
+            ctypes.c_int,
+        )
+        self._kernel32.WaitForMultipleObjectsEx.restype = ctypes.c_uint32
+
+        self._scm = self._advapi32.OpenSCManagerW(None, None, _SC_MANAGER_CONNECT)
+        if not self._scm:
+            msg = f"OpenSCManager failed ({ctypes.get_last_error()})"  # type: ignore[attr-defined]
+            raise NotificationsUnavailable(msg)
+
+        self._service: int | None = None
+        self._service_changed = False
+        # The callback and the notify block must outlive the pending APC.
+        self._callback = _NotifyCallback(self._on_service_notify)
+        self._notify = _ServiceNotify()
+        self._notify.dwVersion = _SERVICE_NOTIFY_STATUS_CHANGE
+        self._notify.pfnNotifyCallback = self._callback
+
+        self._keys: list[tuple[ctypes.c_void_p, ctypes.c_void_p]] = []
+        try:
+            for subkey in (_SERVICES_KEY, _TASK_CACHE_KEY):
+                self._keys.append(self._open_key(subkey))
+        except NotificationsUnavailable:
+            self.close()
+            raise
+
+        self._arm_service()
+
+    def _open_key(self, subkey: str) -> tuple[ctypes.c_void_p, ctypes.c_void_p]:
+        hkey = ctypes.c_void_p()
+        rc = self._advapi32.RegOpenKeyExW(
+            ctypes.c_void_p(_HKEY_LOCAL_MACHINE),
+            subkey,
+            0,
+            _KEY_NOTIFY,
+            ctypes.byref(hkey),
+        )
+        if rc != _ERROR_SUCCESS:
+            msg = f"RegOpenKeyEx({subkey!r}) failed ({rc})"
+            raise NotificationsUnavailable(msg)
+        event = ctypes.c_void_p(self._kernel32.CreateEventW(None, False, False, None))
+        pair = (hkey, event)
+        self._arm_key(pair)
+        return pair
+
+    def _arm_key(self, pair: tuple[ctypes.c_void_p, ctypes.c_void_p]) -> None:
+        hkey, event = pair
+        rc = self._advapi32.RegNotifyChangeKeyValue(
+            hkey,
+            True,  # watch the whole subtree
+            _REG_NOTIFY_CHANGE_NAME | _REG_NOTIFY_CHANGE_LAST_SET,
+            event,
+            True,  # asynchronous
+        )
+        if rc != _ERROR_SUCCESS:
+            msg = f"RegNotifyChangeKeyValue failed ({rc})"
+            raise NotificationsUnavailable(msg)
+
+    def _on_service_notify(self, _param: int | None) -> None:
+        self._service_changed = True
+
+    def _arm_service(self) -> None:
+        # The service may not exist (yet); the registry watch on the
+        # Services tree wakes us up when it is created.
+        if self._service is None:
+            handle = self._advapi32.OpenServiceW(
+                self._scm, self.service_name, _SERVICE_QUERY_STATUS
+            )
+            if not handle:
+                return
+            self._service = handle
+        rc = self._advapi32.NotifyServiceStatusChangeW(
+            self._service, _SERVICE_NOTIFY_MASK, ctypes.byref(self._notify)
+        )
+        if rc != _ERROR_SUCCESS:
+            # e.g. ERROR_SERVICE_MARKED_FOR_DELETE: drop the handle so the
+            # deletion can complete, and retry on the next wake-up.
+            logger.debug(f"NotifyServiceStatusChange failed ({rc}); re-arming later.")
+            self._close_service()
+
+    def _close_service(self) -> None:
+        if self._service is not None:
+            self._advapi32.CloseServiceHandle(self._service)
+            self._service = None
+
+    def wait(self, timeout: float) -> bool:
+        events = (ctypes.c_void_p * len(self._keys))(*(e for _, e in self._keys))
+        rc = self._kernel32.WaitForMultipleObjectsEx(
+            len(self._keys),
+            events,
+            False,  # any handle
+            max(0, int(timeout * 1000)),
+            True,  # alertable, so the service APC can run
+        )
+        if rc == _WAIT_TIMEOUT:
+            return False
+        if rc == _WAIT_IO_COMPLETION:
+            if self._service_changed:
+                self._service_changed = False
+                triggered = self._notify.dwNotificationTriggered
+                if triggered & _SERVICE_NOTIFY_DELETE_PENDING:
+                    self._stale_service()
+                self._arm_service()
+            return True
+        index = rc - _WAIT_OBJECT_0
+        if 0 <= index < len(self._keys):
+            self._arm_key(self._keys[index])
+            # The service may have been created, deleted or reconfigured.
+            self._close_service()
+            self._arm_service()
+            if index == 0:  # the Services tree, opened first
+                self._stale_service()
+            return True
+        logger.debug(f"WaitForMultipleObjectsEx returned {rc:#x}")
+        return False
+
+    def _stale_service(self) -> None:
+        if self.on_service_change is not None:
+            self.on_service_change()
+
+    def close(self) -> None:
+        self._close_service()
+        for hkey, event in self._keys:
+            self._advapi32.RegCloseKey(hkey)
+            self._kernel32.CloseHandle(event)
+        self._keys = []
+        if self._scm:
+            self._advapi32.CloseServiceHandle(self._scm)
+            self._scm = None
+
+
+def open_notification_source(
+    service_name: str,
+    factory: Callable[..., NotificationSource] = Win32ChangeSource,
+    on_service_change: Callable[[], None] | None = None,
+) -> NotificationSource | None:
+    """Return a notification source, or None if notifications are unavailable."""
+    try:
+        return factory(service_name, on_service_change=on_service_change)
+    except (NotificationsUnavailable, OSError) as e:
+        logger.debug(f"Change notifications unavailable, polling instead: {e}")
+        return None
+
+
+__all__ = [
+    "NotificationSource",
+    "NotificationsUnavailable",
+    "Win32ChangeSource",
+    "open_notification_source",
+]
@@ -0,0 +1,112 @@
+"""Adaptive pacing for the polling watcher.
+
+`AdaptivePoller` decides how long to wait before the next probe:
+
+- right after a state transition it polls at `fast_interval` for a burst of
+  `burst_polls` probes, since related changes tend to follow each other;
+- while the service is in a pending state ("start pending", "stop pending",
+  ...) it keeps polling fast until the state settles;
+- otherwise every unchanged snapshot multiplies the interval by `backoff`,
+  up to `max_interval`.
+
+Time is read through a `Clock` so the behaviour can be driven by a fake
+clock in tests and simulations.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
+    from super_ctf.watcher import Status
+
+PENDING_STATES = frozenset(
+    {"start pending", "stop pending", "continue pending", "pause pending"}
+)
+
+
+class Clock(Protocol):
+    def monotonic(self) -> float: ...
+    def sleep(self, seconds: float) -> None: ...
+
+
+class SystemClock:
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    fast_interval: float = 0.25
+    max_interval: float = 5.0
+    backoff: float = 2.0
+    burst_polls: int = 4
+    pending_states: frozenset[str] = field(default=PENDING_STATES)
+
+
+class AdaptivePoller:
+    """Track snapshots and compute the delay before the next probe."""
+
+    def __init__(self, policy: PollPolicy | None = None) -> None:
+        self.policy = policy or PollPolicy()
+        self.interval = self.policy.fast_interval
+        self._burst_left = self.policy.burst_polls
+        self._last: Status | None = None
+
+    def observe(self, status: Status) -> bool:
+        """Record a snapshot; return True if it differs from the previous one."""
+        policy = self.policy
+        changed = status != self._last
+        self._last = status
+
+        if changed:
+            self._burst_left = policy.burst_polls
+            self.interval = policy.fast_interval
+        elif status.service_state_text in policy.pending_states:
+            self.interval = policy.fast_interval
+        elif self._burst_left > 0:
+            self._burst_left -= 1
+            self.interval = policy.fast_interval
+        else:
+            self.interval = min(self.interval * policy.backoff, policy.max_interval)
+        return changed
+
+
+def paced(
+    statuses: Iterable[Status],
+    policy: PollPolicy | None = None,
+    clock: Clock | None = None,
+) -> Generator[Status]:
+    """Pull snapshots from `statuses` (e.g. `check_watch()`) at an adaptive pace.
+
+    Every snapshot is yielded. The wait is measured from the start of the
+    previous probe, so slow probes do not stretch the interval further.
+    """
+    poller = AdaptivePoller(policy)
+    clock = clock or SystemClock()
+
+    started = clock.monotonic()
+    for status in statuses:
+        poller.observe(status)
+        yield status
+        delay = started + poller.interval - clock.monotonic()
+        if delay > 0:
+            clock.sleep(delay)
+        started = clock.monotonic()
+
+
+__all__ = [
+    "PENDING_STATES",
+    "AdaptivePoller",
+    "Clock",
+    "PollPolicy",
+    "SystemClock",
+    "paced",
+]
@@ -0,0 +1,160 @@
+"""Platform abstraction for the persistency layer.
+
+The rest of the application talks to services, scheduled tasks and the
+single-instance mutex through a `Backend`, which also creates the
+`BatchBackend` that `super_ctf.targets.check_watch_many` watches many
+targets through:
+
+- `win32_backend()` wraps the existing pywin32 code (`TestService`, the
+  functions in `persistency.task`, `MutexByName` and
+  `super_ctf.targets.Win32BatchBackend`);
+- `super_ctf.persistency.fake.fake_backend()` is an in-memory implementation
+  with configurable latency and failure injection.
+
+Nothing here imports pywin32, so this module (and everything that only
+depends on it) can be imported, benchmarked and profiled on any platform.
+`get_backend()` picks the pywin32 backend on Windows and the fake elsewhere;
+set `SUPER_CTF_BACKEND=fake` or `=win32` to override.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from super_ctf.targets import BatchBackend
+
+SERVICE_NAME = "CTFService"
+MUTEX_NAME = "Global\\MyUniqueAppMutex"
+START_TYPE_NAMES = ("auto", "manual", "disabled")
+
+
+@dataclass
+class ServiceInfo:
+    exists: bool
+    running: bool
+    enabled: bool
+    state_text: str
+    start_type_text: str
+
+
+class ServiceBackend(Protocol):
+    def install_service(self) -> None: ...
+    def remove_service(self) -> None: ...
+    def run_service(self) -> None: ...
+    def stop_service(self) -> None: ...
+    def get_service_info(self) -> ServiceInfo: ...
+    def set_start_type(self, start_type: str) -> None:
+        """Set the start type to one of `START_TYPE_NAMES`."""
+        ...
+
+    def invalidate(self) -> None:
+        """Drop cached handles, e.g. after the service was deleted or recreated."""
+        ...
+
+
+class TaskBackend(Protocol):
+    def create_task(
+        self, task_name: str, file_to_run: str, minutes_from_now: int = 3
+    ) -> None: ...
+    def delete_task(self, task_name: str) -> bool: ...
+    def check_task_status(self, task_name: str) -> bool: ...
+
+
+class MutexBackend(Protocol):
+    def create(self) -> bool: ...
+    def is_up(self) -> bool: ...
+    def close(self) -> None: ...
+
+
+@dataclass
+class Backend:
+    name: str
+    service: ServiceBackend
+    tasks: TaskBackend
+    mutex: Callable[[str], MutexBackend]
+    # a new batch backend, with its own caches, per multi-target watcher
+    batch: Callable[[], BatchBackend]
+
+
+class _Win32Tasks:
+    """`TaskBackend` over the functions in `persistency.task`."""
+
+    def create_task(
+        self, task_name: str, file_to_run: str, minutes_from_now: int = 3
+    ) -> None:
+        from super_ctf.persistency import task  # noqa: PLC0415
+
+        task.create_task(task_name, file_to_run, minutes_from_now)
+
+    def delete_task(self, task_name: str) -> bool:
+        from super_ctf.persistency import task  # noqa: PLC0415
+
+        return task.delete_task(task_name)
+
+    def check_task_status(self, task_name: str) -> bool:
+        from super_ctf.persistency import task  # noqa: PLC0415
+
+        return task.check_task_status(task_name)
+
+
+def _win32_batch() -> BatchBackend:
+    from super_ctf.targets import Win32BatchBackend  # noqa: PLC0415
+
+    return Win32BatchBackend()
+
+
+def win32_backend() -> Backend:
+    # pywin32 is only imported when this backend is actually requested.
+    from super_ctf.persistency.mutex import MutexByName  # noqa: PLC0415
+    from super_ctf.persistency.service import TestService  # noqa: PLC0415
+
+    return Backend(
+        name="win32",
+        service=TestService,  # classmethods satisfy ServiceBackend
+        tasks=_Win32Tasks(),
+        mutex=lambda name: MutexByName(name=name),
+        batch=_win32_batch,
+    )
+
+
+_backend: Backend | None = None
+
+
+def set_backend(backend: Backend | None) -> None:
+    """Install `backend` process-wide; None re-selects it on next use."""
+    global _backend  # noqa: PLW0603
+    _backend = backend
+
+
+def get_backend() -> Backend:
+    global _backend  # noqa: PLW0603
+    if _backend is None:
+        default = "win32" if os.name == "nt" else "fake"
+        choice = os.environ.get("SUPER_CTF_BACKEND", default)
+        if choice == "win32":
+            _backend = win32_backend()
+        else:
+            from super_ctf.persistency.fake import fake_backend  # noqa: PLC0415
+
+            _backend = fake_backend()
+    return _backend
+
+
+__all__ = [
+    "MUTEX_NAME",
+    "SERVICE_NAME",
+    "START_TYPE_NAMES",
+    "Backend",
+    "MutexBackend",
+    "ServiceBackend",
+    "ServiceInfo",
+    "TaskBackend",
+    "get_backend",
+    "set_backend",
+    "win32_backend",
+]
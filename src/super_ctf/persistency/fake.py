@@ -0,0 +1,244 @@
+"""In-memory persistency backend for non-Windows hosts, load tests and demos.
+
+`FakeSystem` holds the simulated state: services, scheduled tasks and named
+mutexes. Every operation goes through `FakeSystem.call`, which applies the
+configured latency and failure injection:
+
+    system = FakeSystem(latency=0.02, failure_rate={"get_service_info": 0.1})
+    set_backend(fake_backend(system))
+
+`fail_next("delete_task")` makes the next call to that operation raise
+`FakeBackendError`. `FakeSystem` also implements the `BatchBackend` protocol
+from `super_ctf.targets` (it is the fake backend's `batch()`), so it can
+stand in for thousands of targets.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from super_ctf.persistency.backend import (
+    SERVICE_NAME,
+    START_TYPE_NAMES,
+    Backend,
+    ServiceInfo,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_MISSING_SERVICE = ServiceInfo(
+    exists=False,
+    running=False,
+    enabled=False,
+    state_text="None",
+    start_type_text="None",
+)
+
+
+class FakeBackendError(OSError):
+    """Raised by an injected failure."""
+
+
+@dataclass
+class FakeService:
+    state_text: str = "stopped"
+    start_type_text: str = "manual"
+
+    def info(self) -> ServiceInfo:
+        return ServiceInfo(
+            exists=True,
+            running=self.state_text == "running",
+            enabled=self.start_type_text != "disabled",
+            state_text=self.state_text,
+            start_type_text=self.start_type_text,
+        )
+
+
+@dataclass
+class FakeSystem:
+    latency: float = 0.0
+    failure_rate: dict[str, float] = field(default_factory=dict)
+    seed: int | None = None
+    sleep: Callable[[float], None] = time.sleep
+
+    services: dict[str, FakeService] = field(default_factory=dict)
+    tasks: dict[str, bool] = field(default_factory=dict)
+    mutexes: set[str] = field(default_factory=set)
+    calls: Counter[str] = field(default_factory=Counter)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.seed)
+        self._fail_next: Counter[str] = Counter()
+
+    def fail_next(self, operation: str, times: int = 1) -> None:
+        self._fail_next[operation] += times
+
+    def call[T](self, operation: str, fn: Callable[[], T]) -> T:
+        """Run `fn` under the state lock after injected latency/failures."""
+        if self.latency:
+            self.sleep(self.latency)
+        with self._lock:
+            self.calls[operation] += 1
+            if self._fail_next[operation] > 0:
+                self._fail_next[operation] -= 1
+                msg = f"injected failure in {operation}"
+                raise FakeBackendError(msg)
+            rate = self.failure_rate.get(operation, 0.0)
+            if rate and self._rng.random() < rate:
+                msg = f"injected random failure in {operation}"
+                raise FakeBackendError(msg)
+            return fn()
+
+    # === BatchBackend ===
+    def query_services(self, names: frozenset[str]) -> dict[str, ServiceInfo]:
+        def query() -> dict[str, ServiceInfo]:
+            return {
+                n: s.info() if (s := self.services.get(n)) else _MISSING_SERVICE
+                for n in names
+            }
+
+        return self.call("query_services", query)
+
+    def query_tasks(self, names: frozenset[str]) -> dict[str, bool]:
+        return self.call(
+            "query_tasks", lambda: {n: self.tasks.get(n, False) for n in names}
+        )
+
+
+class FakeServiceBackend:
+    def __init__(self, system: FakeSystem, service_name: str = SERVICE_NAME) -> None:
+        self.system = system
+        self.service_name = service_name
+
+    def install_service(self) -> None:
+        def install() -> None:
+            self.system.services.setdefault(self.service_name, FakeService())
+
+        self.system.call("install_service", install)
+
+    def remove_service(self) -> None:
+        self.system.call(
+            "remove_service", lambda: self.system.services.pop(self.service_name, None)
+        )
+
+    def _set_state(self, operation: str, state_text: str) -> None:
+        def set_state() -> None:
+            service = self.system.services.get(self.service_name)
+            if service is None:
+                logger.debug(f"❌ Fake service '{self.service_name}' does not exist.")
+                return
+            service.state_text = state_text
+
+        self.system.call(operation, set_state)
+
+    def run_service(self) -> None:
+        self._set_state("run_service", "running")
+
+    def stop_service(self) -> None:
+        self._set_state("stop_service", "stopped")
+
+    def get_service_info(self) -> ServiceInfo:
+        def query() -> ServiceInfo:
+            service = self.system.services.get(self.service_name)
+            return service.info() if service else _MISSING_SERVICE
+
+        return self.system.call("get_service_info", query)
+
+    def set_start_type(self, start_type: str) -> None:
+        if start_type not in START_TYPE_NAMES:
+            msg = f"Unknown start type: {start_type!r}"
+            raise ValueError(msg)
+
+        def set_start_type() -> None:
+            service = self.system.services.get(self.service_name)
+            if service is not None:
+                service.start_type_text = start_type
+
+        self.system.call("set_start_type", set_start_type)
+
+    def invalidate(self) -> None:
+        """Nothing is cached in memory."""
+
+
+class FakeTaskBackend:
+    def __init__(self, system: FakeSystem) -> None:
+        self.system = system
+
+    def create_task(
+        self,
+        task_name: str,
+        file_to_run: str,  # noqa: ARG002
+        minutes_from_now: int = 3,  # noqa: ARG002
+    ) -> None:
+        self.system.call(
+            "create_task", lambda: self.system.tasks.update({task_name: True})
+        )
+
+    def delete_task(self, task_name: str) -> bool:
+        return self.system.call(
+            "delete_task", lambda: self.system.tasks.pop(task_name, None) is not None
+        )
+
+    def check_task_status(self, task_name: str) -> bool:
+        return self.system.call(
+            "check_task_status", lambda: self.system.tasks.get(task_name, False)
+        )
+
+
+class FakeMutex:
+    def __init__(self, system: FakeSystem, name: str) -> None:
+        self.system = system
+        self.name = name
+        self._owned = False
+
+    def create(self) -> bool:
+        def create() -> bool:
+            if self.name in self.system.mutexes:
+                return False
+            self.system.mutexes.add(self.name)
+            self._owned = True
+            return True
+
+        return self.system.call("mutex_create", create)
+
+    def is_up(self) -> bool:
+        return self.system.call("mutex_is_up", lambda: self.name in self.system.mutexes)
+
+    def close(self) -> None:
+        def close() -> None:
+            if self._owned:
+                self.system.mutexes.discard(self.name)
+                self._owned = False
+
+        self.system.call("mutex_close", close)
+
+
+def fake_backend(system: FakeSystem | None = None) -> Backend:
+    system = system or FakeSystem()
+    return Backend(
+        name="fake",
+        service=FakeServiceBackend(system),
+        tasks=FakeTaskBackend(system),
+        mutex=lambda name: FakeMutex(system, name),
+        batch=lambda: system,
+    )
+
+
+__all__ = [
+    "FakeBackendError",
+    "FakeMutex",
+    "FakeService",
+    "FakeServiceBackend",
+    "FakeSystem",
+    "FakeTaskBackend",
+    "fake_backend",
+]
@@ -5,7 +5,7 @@ import win32event
 import winerror
 from loguru import logger
 
-MUTEX_NAME = "Global\\MyUniqueAppMutex"
+from super_ctf.persistency.backend import MUTEX_NAME
 
 
 @dataclass
@@ -1,7 +1,11 @@
+import contextlib
 import os
 import socket
 import sys
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, Protocol
 
 import pywintypes
 import servicemanager
@@ -12,6 +16,9 @@ import win32service
 import win32serviceutil
 from loguru import logger
 
+from super_ctf.logs import transitions
+from super_ctf.persistency.backend import SERVICE_NAME, ServiceInfo
+
 # Map numeric state to readable text
 STATES: dict[int, str] = {
     win32service.SERVICE_STOPPED: "stopped",
@@ -30,20 +37,176 @@ START_TYPES = {
 }
 
 
-@dataclass
-class ServiceInfo:
-    exists: bool
-    running: bool
-    enabled: bool
-    state_text: str
-    start_type_text: str
+class ServiceQueryError(Exception):
+    """Raised by a service manager adapter when a Win32 call fails."""
+
+    def __init__(self, code: int, message: str = "") -> None:
+        super().__init__(code, message)
+        self.code = code
+        self.message = message
+
+
+class ServiceManagerAdapter(Protocol):
+    """The few Service Control Manager calls needed to query a service."""
+
+    def open_scm(self) -> Any: ...  # noqa: ANN401
+    def open_service(self, scm: Any, service_name: str) -> Any: ...  # noqa: ANN401
+    def query_state(self, service: Any) -> int: ...  # noqa: ANN401
+    def query_start_type(self, service: Any) -> int: ...  # noqa: ANN401
+    def close_handle(self, handle: Any) -> None: ...  # noqa: ANN401
+
+
+class Win32ServiceManager:
+    """`ServiceManagerAdapter` backed by pywin32."""
+
+    def open_scm(self) -> Any:  # noqa: ANN401
+        try:
+            return win32service.OpenSCManager(
+                None, None, win32service.SC_MANAGER_CONNECT
+            )
+        except pywintypes.error as e:
+            raise ServiceQueryError(e.winerror, e.strerror) from e
+
+    def open_service(self, scm: Any, service_name: str) -> Any:  # noqa: ANN401
+        try:
+            return win32service.OpenService(
+                scm,
+                service_name,
+                win32service.SERVICE_QUERY_STATUS | win32service.SERVICE_QUERY_CONFIG,
+            )
+        except pywintypes.error as e:
+            raise ServiceQueryError(e.winerror, e.strerror) from e
+
+    def query_state(self, service: Any) -> int:  # noqa: ANN401
+        try:
+            return win32service.QueryServiceStatus(service)[1]
+        except pywintypes.error as e:
+            raise ServiceQueryError(e.winerror, e.strerror) from e
+
+    def query_start_type(self, service: Any) -> int:  # noqa: ANN401
+        try:
+            return win32service.QueryServiceConfig(service)[1]
+        except pywintypes.error as e:
+            raise ServiceQueryError(e.winerror, e.strerror) from e
+
+    def close_handle(self, handle: Any) -> None:  # noqa: ANN401
+        with contextlib.suppress(pywintypes.error):
+            win32service.CloseServiceHandle(handle)
+
+
+# Longest time a service handle is kept before a fresh OpenService, and
+# how long a failed OpenService is remembered before trying again.
+HANDLE_MAX_AGE = 5.0
+
+
+class ServiceQuerySession:
+    """Answer status and config queries from a cached SCM/service handle pair.
+
+    An open service handle keeps a deleted service "marked for delete", and
+    queries on it keep succeeding. The service handle is therefore never
+    held for long:
+
+    - it is reopened with a fresh `OpenService` once it is `max_age` seconds
+      old, which lets a deletion made outside the app complete (the open
+      then fails and the service is reported missing);
+    - `invalidate()` drops it at once; the watcher calls it when the change
+      notifications report a Services key change or a pending deletion;
+    - a failed query reopens it once.
+
+    The SCM handle is kept, and a failed `OpenService` is remembered for
+    `max_age` seconds, so polling a missing service opens nothing.
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        manager: ServiceManagerAdapter | None = None,
+        max_age: float = HANDLE_MAX_AGE,
+        now: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.service_name = service_name
+        self.manager: ServiceManagerAdapter = manager or Win32ServiceManager()
+        self.max_age = max_age
+        self.now = now
+        self._scm: Any = None
+        self._service: Any = None
+        self._opened_at = 0.0
+        # (code, message) of the last OpenService failure, and when it
+        # happened; each cached answer raises a new `ServiceQueryError`
+        self._missing: tuple[int, str] | None = None
+        self._missing_at = 0.0
+        self._lock = threading.Lock()
+        self.opens = 0
+
+    def _open(self, now: float) -> None:
+        if self._missing is not None and now - self._missing_at < self.max_age:
+            raise ServiceQueryError(*self._missing)
+        if self._scm is None:
+            self._scm = self.manager.open_scm()
+        try:
+            self._service = self.manager.open_service(self._scm, self.service_name)
+        except ServiceQueryError as e:
+            self._missing, self._missing_at = (e.code, e.message), now
+            raise
+        self._missing = None
+        self._opened_at = now
+        self.opens += 1
+
+    def _close_service(self) -> None:
+        if self._service is not None:
+            self.manager.close_handle(self._service)
+            self._service = None
+
+    def _close(self) -> None:
+        self._close_service()
+        if self._scm is not None:
+            self.manager.close_handle(self._scm)
+            self._scm = None
+        self._missing = None
+
+    def _query(self, now: float) -> tuple[int, int]:
+        if self._service is None:
+            self._open(now)
+        return (
+            self.manager.query_state(self._service),
+            self.manager.query_start_type(self._service),
+        )
+
+    def query(self) -> tuple[int, int]:
+        """Return `(state, start_type)` for the service.
+
+        Raises `ServiceQueryError` if the service does not exist.
+        """
+        with self._lock:
+            now = self.now()
+            if self._service is not None and now - self._opened_at >= self.max_age:
+                self._close_service()
+            try:
+                return self._query(now)
+            except ServiceQueryError:
+                if self._service is None:
+                    raise  # OpenService failed: the service is missing
+                # Stale handle (service removed/reinstalled); reopen once.
+                self._close()
+            try:
+                return self._query(now)
+            except ServiceQueryError:
+                self._close_service()
+                raise
+
+    def invalidate(self) -> None:
+        """Drop the cached handles; the next query reopens them."""
+        with self._lock:
+            self._close()
 
 
 class TestService(win32serviceutil.ServiceFramework):
-    _svc_name_ = "CTFService"
+    _svc_name_ = SERVICE_NAME
     _svc_display_name_ = "CTF Service"
     _svc_description_ = "Good Job"
 
+    _query_session: ServiceQuerySession | None = None
+
     def __init__(self, args) -> None:  # noqa: ANN001
         win32serviceutil.ServiceFramework.__init__(self, args)
         self.hWaitStop = win32event.CreateEvent(None, 0, 0, None)
@@ -70,6 +233,7 @@ class TestService(win32serviceutil.ServiceFramework):
         if exe_path is None:
             exe_path = sys.executable + f' "{os.path.abspath(sys.argv[0])}"'
             print(exe_path)
+        cls.query_session().invalidate()
         try:
             # win32serviceutil.InstallService(
             #     serviceName=cls._svc_name_,
@@ -93,6 +257,8 @@ class TestService(win32serviceutil.ServiceFramework):
         if exe_path is None:
             exe_path = sys.executable + f' "{os.path.abspath(sys.argv[0])}"'
 
+        # An open query handle would keep the service "marked for delete".
+        cls.query_session().invalidate()
         try:
             win32serviceutil.HandleCommandLine(TestService, argv=["NONE", "remove"])
             logger.debug(f"✅ Service '{cls._svc_name_}' removed successfully.")
@@ -121,50 +287,33 @@ class TestService(win32serviceutil.ServiceFramework):
         except pywintypes.error as e:
             logger.debug(f"❌ Failed to stop service '{cls._svc_name_}': {e}")
 
+    @classmethod
+    def query_session(cls) -> ServiceQuerySession:
+        """Return the shared handle-caching session for this service."""
+        if cls._query_session is None:
+            cls._query_session = ServiceQuerySession(cls._svc_name_)
+        return cls._query_session
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the cached service handles (see `ServiceQuerySession`)."""
+        cls.query_session().invalidate()
+
     @classmethod
     def get_service_info(cls) -> ServiceInfo:
         service_name = cls._svc_name_
 
+        # Polled several times a second: only log state transitions.
+        key = ("service", service_name)
         try:
-            # --- 1️⃣ Query the service status ---
-            status = win32serviceutil.QueryServiceStatus(service_name)
-            state = status[1]
-            is_running = state == win32service.SERVICE_RUNNING
-
-            # --- 2️⃣ Query the startup type (enabled/disabled/manual) ---
-            scm = win32service.OpenSCManager(
-                None, None, win32service.SC_MANAGER_CONNECT
-            )
-            service = win32service.OpenService(
-                scm,
+            state, start_type = cls.query_session().query()
+        except ServiceQueryError as e:
+            transitions.debug(
+                key,
+                None,
+                "❌ Service '{}' does not exist or could not be queried: {}",
                 service_name,
-                win32service.SERVICE_QUERY_CONFIG,
-            )
-            config = win32service.QueryServiceConfig(service)
-            start_type = config[1]  # second element is the start type
-            is_enabled = start_type != win32service.SERVICE_DISABLED
-
-            # Cleanup handles
-            win32service.CloseServiceHandle(service)
-            win32service.CloseServiceHandle(scm)
-
-            logger.debug(f"✅ Service '{service_name}' exists.")
-            logger.debug(f"   → State: {STATES.get(state, 'unknown')} ({state})")
-            logger.debug(
-                f"   → Enabled: {is_enabled} ({START_TYPES.get(start_type, 'unknown')})"
-            )
-
-            return ServiceInfo(
-                exists=True,
-                running=is_running,
-                enabled=is_enabled,
-                state_text=STATES.get(state, "unknown"),
-                start_type_text=START_TYPES.get(start_type, "unknown"),
-            )
-
-        except pywintypes.error as e:
-            logger.debug(
-                f"❌ Service '{service_name}' does not exist or could not be queried: {e}"
+                e,
             )
             return ServiceInfo(
                 exists=False,
@@ -174,14 +323,42 @@ class TestService(win32serviceutil.ServiceFramework):
                 start_type_text="None",
             )
 
+        is_running = state == win32service.SERVICE_RUNNING
+        is_enabled = start_type != win32service.SERVICE_DISABLED
+        state_text = STATES.get(state, "unknown")
+        start_type_text = START_TYPES.get(start_type, "unknown")
+
+        transitions.debug(
+            key,
+            (state, start_type),
+            "✅ Service '{}' exists.\n   → State: {} ({})\n   → Enabled: {} ({})",
+            service_name,
+            state_text,
+            state,
+            is_enabled,
+            start_type_text,
+        )
+
+        return ServiceInfo(
+            exists=True,
+            running=is_running,
+            enabled=is_enabled,
+            state_text=state_text,
+            start_type_text=start_type_text,
+        )
+
     @classmethod
-    def set_start_manual(cls) -> None:
-        """Set the service start type to 'manual' (SERVICE_DEMAND_START).
+    def set_start_type(cls, start_type: str) -> None:
+        """Set the service start type ("auto", "manual" or "disabled").
 
-        This updates the service configuration so it does not start
-        automatically on boot.
+        Only the start type is changed; the rest of the service
+        configuration is left as is.
         """
         service_name = cls._svc_name_
+        codes = {text: code for code, text in START_TYPES.items()}
+        if start_type not in codes:
+            msg = f"Unknown start type: {start_type!r}"
+            raise ValueError(msg)
         try:
             scm = win32service.OpenSCManager(
                 None, None, win32service.SC_MANAGER_ALL_ACCESS
@@ -196,7 +373,7 @@ class TestService(win32serviceutil.ServiceFramework):
             win32service.ChangeServiceConfig(
                 service,
                 win32service.SERVICE_NO_CHANGE,
-                win32service.SERVICE_DEMAND_START,
+                codes[start_type],
                 win32service.SERVICE_NO_CHANGE,
                 None,
                 None,
@@ -209,10 +386,21 @@ class TestService(win32serviceutil.ServiceFramework):
 
             win32service.CloseServiceHandle(service)
             win32service.CloseServiceHandle(scm)
-            logger.debug(f"ℹ️ Service '{service_name}' start type set to 'manual'.")
+            logger.debug(
+                f"✅ Service '{service_name}' start type set to '{start_type}'."
+            )
         except pywintypes.error as e:
             logger.debug(f"❌ Failed to set start type for '{service_name}': {e}")
 
+    @classmethod
+    def set_start_manual(cls) -> None:
+        """Set the service start type to 'manual' (SERVICE_DEMAND_START).
+
+        This updates the service configuration so it does not start
+        automatically on boot.
+        """
+        cls.set_start_type("manual")
+
 
 def show_popup(message: str, title: str = "Notification") -> None:
     # hwnd = 0 (no parent window)
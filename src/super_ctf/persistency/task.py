@@ -1,43 +1,162 @@
+import atexit
 import contextlib
 import datetime
+import threading
+from collections.abc import Callable
+from typing import Any
 
-import win32com.client
 from loguru import logger
 
+from super_ctf.logs import transitions
+
 # === CONFIGURATION ===
 TASK_NAME = "CTFScheduledTask"
 FILE_TO_RUN = r"C:\Users\Sivan\source\repos\SuperCTFMsgBox1\x64\Debug\SuperCTFMsgBox1.exe"  # or .exe, .py, etc.
 
+SchedulerFactory = Callable[[], Any]
 
-def create_task(
-    task_name: str = TASK_NAME,
-    file_to_run: str = FILE_TO_RUN,
-    minutes_from_now: int = 3,
-) -> None:
-    # Ensure any existing task with this name is removed so we create it from scratch
-    with contextlib.suppress(NameError):
-        delete_task(task_name)
 
-    # === CALCULATE START TIME (3 minutes from now) ===
-    # Use timezone-aware timestamp (system local timezone)
-    tz = datetime.datetime.now().astimezone().tzinfo
-    if tz is None:
-        logger.debug("tzinfo not available! Using UTC as fallback.")
-    else:
-        tz = datetime.UTC
+def _dispatch_scheduler() -> Any:  # noqa: ANN401
+    # Imported lazily so the session logic can run against a fake scheduler.
+    import win32com.client  # noqa: PLC0415
+
+    return win32com.client.Dispatch("Schedule.Service")
+
+
+# HRESULTs meaning the scheduler connection itself is gone, as opposed to
+# an error in the operation (e.g. GetTask on a missing task).
+DISCONNECT_HRESULTS = frozenset(
+    {
+        0x800706BA,  # RPC_S_SERVER_UNAVAILABLE
+        0x800706BE,  # RPC_S_CALL_FAILED
+        0x800706BF,  # RPC_S_CALL_FAILED_DNE
+        0x80010007,  # RPC_E_SERVER_DIED
+        0x80010012,  # RPC_E_SERVER_DIED_DNE
+        0x80010108,  # RPC_E_DISCONNECTED
+        0x800401FD,  # CO_E_OBJNOTCONNECTED
+        0x80041315,  # SCHED_E_SERVICE_NOT_RUNNING
+    }
+)
+
+
+def is_disconnect(exc: BaseException) -> bool:
+    """Return True if `exc` (typically a `pywintypes.com_error`) means the
+    connection to the Task Scheduler was lost.
+    """
+    hresult = getattr(exc, "hresult", None)
+    if hresult is None and exc.args and isinstance(exc.args[0], int):
+        hresult = exc.args[0]
+    return isinstance(hresult, int) and hresult & 0xFFFFFFFF in DISCONNECT_HRESULTS
+
+
+class SchedulerSession:
+    """A long-lived Task Scheduler connection.
+
+    The `Schedule.Service` COM object and its root folder are created once
+    and reused by every task operation. COM objects are apartment bound, so
+    one session must only be used from the thread that created it; use
+    `get_session()` to get the session owned by the calling thread.
+
+    The connection is not checked before each operation (that would be one
+    more COM round trip per probe). Instead, an operation failing with an
+    RPC/disconnect error (`is_disconnect`) reconnects and retries once.
+    """
+
+    def __init__(self, factory: SchedulerFactory = _dispatch_scheduler) -> None:
+        self._factory = factory
+        self._scheduler: Any = None
+        self._root_folder: Any = None
+        self.connects = 0
+
+    def _connect(self) -> None:
+        scheduler = self._factory()
+        scheduler.Connect()
+        self._scheduler = scheduler
+        self._root_folder = scheduler.GetFolder("\\")
+        self.connects += 1
+        logger.debug(f"Connected to the Task Scheduler (connect #{self.connects}).")
+
+    def root_folder(self) -> Any:  # noqa: ANN401
+        """Return the cached root folder, connecting first if needed."""
+        if self._root_folder is None:
+            self._connect()
+        return self._root_folder
+
+    def scheduler(self) -> Any:  # noqa: ANN401
+        """Return the cached `Schedule.Service` object, connecting first if needed.
+
+        Objects it creates (e.g. `NewTask` definitions) belong to this
+        connection; build them inside the operation passed to `call()`, so a
+        retry after a reconnect builds them again.
+        """
+        if self._scheduler is None:
+            self._connect()
+        return self._scheduler
+
+    def call[T](self, operation: Callable[[Any], T]) -> T:
+        """Run `operation(root_folder)`, reconnecting once on a dropped connection.
+
+        Other errors (e.g. GetTask on a missing task) are propagated unchanged.
+        """
+        try:
+            return operation(self.root_folder())
+        except Exception as e:
+            if not is_disconnect(e):
+                raise
+            logger.debug("Task Scheduler connection lost; reconnecting.")
+            self.close()
+            return operation(self.root_folder())
+
+    def close(self) -> None:
+        """Release the COM references held by this session."""
+        self._root_folder = None
+        self._scheduler = None
 
-    start_time = datetime.datetime.now(tz=tz) + datetime.timedelta(
-        minutes=minutes_from_now
-    )
-    start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
 
-    # === CREATE THE SCHEDULER OBJECT ===
-    scheduler = win32com.client.Dispatch("Schedule.Service")
-    scheduler.Connect()
+_local = threading.local()
+_default_factory: SchedulerFactory = _dispatch_scheduler
 
-    root_folder = scheduler.GetFolder("\\")
 
-    # === CREATE THE TASK DEFINITION ===
+def set_scheduler_factory(factory: SchedulerFactory = _dispatch_scheduler) -> None:
+    """Change the factory used by sessions created from now on."""
+    global _default_factory  # noqa: PLW0603
+    _default_factory = factory
+
+
+def get_session() -> SchedulerSession:
+    """Return the calling thread's scheduler session, creating it on first use.
+
+    Worker threads close theirs with `close_session()`; the main thread's
+    session is closed at interpreter exit.
+    """
+    session: SchedulerSession | None = getattr(_local, "session", None)
+    if session is None:
+        session = SchedulerSession(_default_factory)
+        _local.session = session
+        if threading.current_thread() is threading.main_thread():
+            atexit.unregister(close_session)  # registered once
+            atexit.register(close_session)
+    return session
+
+
+def close_session() -> None:
+    """Close the calling thread's scheduler session.
+
+    Must be called before `pythoncom.CoUninitialize()` on threads that used
+    the task functions.
+    """
+    session: SchedulerSession | None = getattr(_local, "session", None)
+    if session is not None:
+        session.close()
+        _local.session = None
+
+
+def _task_definition(
+    scheduler: Any,  # noqa: ANN401
+    file_to_run: str,
+    start_time_str: str,
+) -> Any:  # noqa: ANN401
+    """Return a new definition running `file_to_run` once at `start_time_str`."""
     task_def = scheduler.NewTask(0)
 
     # Registration info (optional)
@@ -57,19 +176,51 @@ def create_task(
     # === CREATE THE ACTION ===
     action = task_def.Actions.Create(0)  # 0 = TASK_ACTION_EXEC
     action.Path = file_to_run
+    return task_def
+
+
+def create_task(
+    task_name: str = TASK_NAME,
+    file_to_run: str = FILE_TO_RUN,
+    minutes_from_now: int = 3,
+) -> None:
+    # Ensure any existing task with this name is removed so we create it from scratch
+    with contextlib.suppress(NameError):
+        delete_task(task_name)
+
+    # === CALCULATE START TIME (3 minutes from now) ===
+    # Use timezone-aware timestamp (system local timezone)
+    tz = datetime.datetime.now().astimezone().tzinfo
+    if tz is None:
+        logger.debug("tzinfo not available! Using UTC as fallback.")
+    else:
+        tz = datetime.UTC
+
+    start_time = datetime.datetime.now(tz=tz) + datetime.timedelta(
+        minutes=minutes_from_now
+    )
+    start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    # === REUSE THE SCHEDULER CONNECTION ===
+    session = get_session()
 
     # === REGISTER THE TASK ===
     task_create_or_update = 6
     task_logon_interactive_token = 3
 
-    root_folder.RegisterTaskDefinition(
-        task_name,
-        task_def,
-        task_create_or_update,
-        None,  # no username
-        None,  # no password
-        task_logon_interactive_token,
-    )
+    def register(root_folder: Any) -> None:  # noqa: ANN401
+        # built per attempt: a definition belongs to the connection that made it
+        task_def = _task_definition(session.scheduler(), file_to_run, start_time_str)
+        root_folder.RegisterTaskDefinition(
+            task_name,
+            task_def,
+            task_create_or_update,
+            None,  # no username
+            None,  # no password
+            task_logon_interactive_token,
+        )
+
+    session.call(register)
 
     logger.debug(f"Task '{task_name}' created successfully.")
     logger.debug(f"⏰ It will run at: {start_time_str}")
@@ -80,13 +231,11 @@ def delete_task(task_name: str = TASK_NAME) -> bool:
 
     Returns True if the task was found and deleted, False if it did not exist.
     """
-    scheduler = win32com.client.Dispatch("Schedule.Service")
-    scheduler.Connect()
-    root_folder = scheduler.GetFolder("\\")
+    session = get_session()
 
     try:
         # Attempt to get the task; if it doesn't exist GetTask will raise
-        root_folder.GetTask(task_name)
+        session.call(lambda root_folder: root_folder.GetTask(task_name))
     except Exception:  # noqa: BLE001
         logger.debug(f"Task '{task_name}' does not exist; nothing to delete.")
         return False
@@ -94,7 +243,11 @@ def delete_task(task_name: str = TASK_NAME) -> bool:
     # If we got here, the task exists; unregister it
     try:
         task_ignore_registration_triggers = 0
-        root_folder.DeleteTask(task_name, task_ignore_registration_triggers)
+        session.call(
+            lambda root_folder: root_folder.DeleteTask(
+                task_name, task_ignore_registration_triggers
+            )
+        )
     except Exception as exc:  # noqa: BLE001
         logger.debug(f"Failed to delete task '{task_name}': {exc}")
         return False
@@ -104,22 +257,22 @@ def delete_task(task_name: str = TASK_NAME) -> bool:
 
 
 def check_task_status(task_name: str = TASK_NAME) -> bool:
-    scheduler = win32com.client.Dispatch("Schedule.Service")
-    scheduler.Connect()
-    root_folder = scheduler.GetFolder("\\")
-
+    # Polled several times a second: only log state transitions.
+    key = ("task", task_name)
     try:
-        task = root_folder.GetTask(task_name)
+        task = get_session().call(lambda root_folder: root_folder.GetTask(task_name))
     except Exception:  # noqa: BLE001
-        logger.debug(f"❌ Task '{task_name}' not found.")
+        transitions.debug(key, None, "❌ Task '{}' not found.", task_name)
         return False
 
     # Get enabled/disabled status
     enabled = bool(task.Enabled)
-    if enabled:
-        logger.debug(f"✅ Task '{task_name}' exists and is ENABLED.")
-    else:
-        logger.debug(f"⚠️ Task '{task_name}' exists but is DISABLED.")
+    message = (
+        "✅ Task '{}' exists and is ENABLED."
+        if enabled
+        else "⚠️ Task '{}' exists but is DISABLED."
+    )
+    transitions.debug(key, enabled, message, task_name)
     return enabled
 
 
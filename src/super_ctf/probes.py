@@ -0,0 +1,241 @@
+"""Run the watcher's blocking probes concurrently.
+
+Each probe gets its own single-thread executor, so:
+- the service and task probes run in parallel and a snapshot costs the
+  slower of the two round trips instead of their sum;
+- COM is initialised once per worker thread, and the per-thread Task
+  Scheduler session always lives on the same thread;
+- a hung probe only stalls its own worker. `ProbeWorker.result` waits at
+  most `timeout` seconds and otherwise returns the last known value (or,
+  before the first answer, the worker's `unknown` value), while the
+  in-flight call is left to finish rather than piling up new ones.
+
+`ProbeBatch` is the variant for event loops (asyncio, Tk): it has no
+threads of its own. Each probe call is submitted to an executor shared by
+every batch in the process (`shared_executor()`), and the caller waits for
+the futures the way its loop does.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Executor, Future
+
+PROBE_TIMEOUT = 5.0
+
+_MISSING = object()
+
+
+class ProbeTimeoutError(TimeoutError):
+    """Raised when a probe without an `unknown` value has not answered yet."""
+
+
+def com_initialize() -> None:
+    with contextlib.suppress(ImportError):
+        import pythoncom  # noqa: PLC0415
+
+        pythoncom.CoInitialize()
+
+
+def com_uninitialize() -> None:
+    with contextlib.suppress(ImportError):
+        import pythoncom  # noqa: PLC0415
+
+        pythoncom.CoUninitialize()
+
+
+class ProbeWorker[T]:
+    """A single probe bound to its own worker thread."""
+
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], T],
+        timeout: float = PROBE_TIMEOUT,
+        thread_init: Callable[[], None] = com_initialize,
+        unknown: Any = _MISSING,  # noqa: ANN401
+    ) -> None:
+        self.name = name
+        self.probe = probe
+        self.timeout = timeout
+        self.unknown = unknown
+        self.timeouts = 0
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"probe-{name}",
+            initializer=thread_init,
+        )
+        self._pending: concurrent.futures.Future[T] | None = None
+        self._last: Any = _MISSING
+
+    def submit(self) -> None:
+        """Start a probe unless the previous one is still running."""
+        if self._pending is None:
+            self._pending = self._executor.submit(self.probe)
+
+    def result(self, timeout: float | None = None) -> T:
+        """Wait for the submitted probe.
+
+        If the probe takes longer than `timeout` (default: the worker's
+        timeout), the previous result is returned and the in-flight call is
+        collected on a later cycle. Before the first result there is none:
+        the worker's `unknown` value is returned, or `ProbeTimeoutError` raised
+        if it has none.
+        """
+        self.submit()
+        assert self._pending is not None  # noqa: S101
+        if timeout is None:
+            timeout = self.timeout
+        try:
+            value = self._pending.result(timeout=timeout)
+        except TimeoutError:
+            self.timeouts += 1
+            if self._last is not _MISSING:
+                logger.debug(f"Probe '{self.name}' timed out; reusing last result.")
+                return self._last
+            if self.unknown is not _MISSING:
+                logger.debug(f"Probe '{self.name}' has not answered yet; unknown.")
+                return self.unknown
+            msg = f"probe '{self.name}' did not answer within {timeout:.1f}s"
+            raise ProbeTimeoutError(msg) from None
+        finally:
+            if self._pending.done():
+                self._pending = None
+        self._last = value
+        return value
+
+    def run_on_worker(self, fn: Callable[[], Any]) -> None:
+        """Run `fn` on this worker's thread (e.g. per-thread cleanup)."""
+        self._executor.submit(fn)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class ProbePool:
+    """Run a set of named probes concurrently and collect their results."""
+
+    def __init__(
+        self,
+        probes: dict[str, Callable[[], Any]],
+        timeout: float = PROBE_TIMEOUT,
+        thread_init: Callable[[], None] = com_initialize,
+        thread_exit: Callable[[], None] | None = None,
+        unknown: dict[str, Any] | None = None,
+    ) -> None:
+        """`unknown[name]` is reported for a probe until it first answers."""
+        self.timeout = timeout
+        unknown = unknown or {}
+        self.workers = {
+            name: ProbeWorker(
+                name, probe, timeout, thread_init, unknown.get(name, _MISSING)
+            )
+            for name, probe in probes.items()
+        }
+        self._thread_exit = thread_exit
+
+    def collect(self) -> dict[str, Any]:
+        """Start every probe, then wait for all of them under one deadline."""
+        for worker in self.workers.values():
+            worker.submit()
+        deadline = time.monotonic() + self.timeout
+        return {
+            name: worker.result(max(0.0, deadline - time.monotonic()))
+            for name, worker in self.workers.items()
+        }
+
+    def close(self) -> None:
+        for worker in self.workers.values():
+            if self._thread_exit is not None:
+                worker.run_on_worker(self._thread_exit)
+            worker.close()
+
+
+_executor: concurrent.futures.ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def shared_executor() -> Executor:
+    """Return the COM-initialised executor shared by every `ProbeBatch`."""
+    global _executor  # noqa: PLW0603
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                thread_name_prefix="probe", initializer=com_initialize
+            )
+        return _executor
+
+
+class ProbeBatch:
+    """A set of named probes run on a shared executor, one call per probe at a time.
+
+    `submit()` starts every probe that is not still running and returns the
+    in-flight futures; once they are done, or the caller's `timeout` is up,
+    `collect()` takes their results. A probe that has not finished
+    contributes its last result, or its `unknown` value before it first
+    answered (`ProbeTimeoutError` if it has none). Probe exceptions are
+    re-raised by `collect()`.
+    """
+
+    def __init__(
+        self,
+        probes: dict[str, Callable[[], Any]],
+        timeout: float = PROBE_TIMEOUT,
+        executor: Executor | None = None,
+        unknown: dict[str, Any] | None = None,
+    ) -> None:
+        self.probes = probes
+        self.timeout = timeout
+        self.executor = executor or shared_executor()
+        self.unknown = unknown or {}
+        self.timeouts = 0
+        self._pending: dict[str, Future[Any]] = {}
+        self._last: dict[str, Any] = {}
+
+    def submit(self) -> list[Future[Any]]:
+        for name, probe in self.probes.items():
+            if name not in self._pending:
+                self._pending[name] = self.executor.submit(probe)
+        return list(self._pending.values())
+
+    def done(self) -> bool:
+        return all(future.done() for future in self._pending.values())
+
+    def _result(self, name: str) -> Any:  # noqa: ANN401
+        future = self._pending.get(name)
+        if future is not None and future.done():
+            del self._pending[name]
+            self._last[name] = future.result()
+            return self._last[name]
+        self.timeouts += 1
+        if name in self._last:
+            return self._last[name]
+        if name in self.unknown:
+            return self.unknown[name]
+        msg = f"probe '{name}' did not answer within {self.timeout:.1f}s"
+        raise ProbeTimeoutError(msg)
+
+    def collect(self) -> dict[str, Any]:
+        """Return every probe's result without waiting (see the class doc)."""
+        return {name: self._result(name) for name in self.probes}
+
+
+__all__ = [
+    "PROBE_TIMEOUT",
+    "ProbeBatch",
+    "ProbePool",
+    "ProbeTimeoutError",
+    "ProbeWorker",
+    "com_initialize",
+    "com_uninitialize",
+    "shared_executor",
+]
@@ -0,0 +1,179 @@
+"""Watch many services and scheduled tasks in one loop.
+
+`check_watch_many` is the multi-target counterpart of `check_watch`. Instead
+of one lookup per target it asks a `BatchBackend` for all services and all
+tasks at once, so the cost of a cycle grows with the number of batched calls
+rather than with the number of targets:
+
+- `Win32BatchBackend` gets every service state from a single
+  `EnumServicesStatusEx` call and every task from a single enumeration of
+  the Task Scheduler root folder. Start types are not part of
+  `EnumServicesStatusEx`; they are cached and refreshed for services that
+  (re)appear or change state, plus a fixed-size round-robin batch per cycle.
+- `super_ctf.persistency.fake.FakeSystem` keeps everything in memory and
+  counts calls, for benchmarking thousands of targets on any platform
+  (see `super_ctf.bench.targets`).
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import TYPE_CHECKING, NamedTuple, Protocol
+
+from super_ctf.persistency.backend import ServiceInfo, get_backend
+from super_ctf.watcher import Status
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
+MISSING_SERVICE = ServiceInfo(
+    exists=False,
+    running=False,
+    enabled=False,
+    state_text="None",
+    start_type_text="None",
+)
+# Start types refreshed per cycle on top of new or changed services.
+CONFIG_REFRESH_BATCH = 16
+
+
+class BatchBackend(Protocol):
+    def query_services(self, names: frozenset[str]) -> dict[str, ServiceInfo]: ...
+    def query_tasks(self, names: frozenset[str]) -> dict[str, bool]: ...
+
+
+class MultiStatus(NamedTuple):
+    services: dict[str, ServiceInfo]
+    tasks: dict[str, bool]
+
+    def status(self, service_name: str, task_name: str) -> Status:
+        """Return the single-target `Status` for one service/task pair."""
+        return Status.from_probes(
+            self.services.get(service_name, MISSING_SERVICE),
+            self.tasks.get(task_name, False),
+        )
+
+
+class Win32BatchBackend:
+    def __init__(self, config_refresh_batch: int = CONFIG_REFRESH_BATCH) -> None:
+        # Imported lazily: only this backend needs pywin32.
+        import win32service  # noqa: PLC0415
+
+        from super_ctf.persistency.service import START_TYPES, STATES  # noqa: PLC0415
+
+        self._win32service = win32service
+        self._states = STATES
+        self._start_types = START_TYPES
+        self.config_refresh_batch = config_refresh_batch
+        self._scm = win32service.OpenSCManager(
+            None, None, win32service.SC_MANAGER_ENUMERATE_SERVICE
+        )
+        self._last_state: dict[str, int] = {}
+        self._start_type: dict[str, int] = {}
+        self._refresh_cursor = 0
+
+    def _query_start_type(self, name: str) -> int | None:
+        ws = self._win32service
+        try:
+            handle = ws.OpenService(self._scm, name, ws.SERVICE_QUERY_CONFIG)
+        except Exception:  # noqa: BLE001
+            return None
+        try:
+            return ws.QueryServiceConfig(handle)[1]
+        except Exception:  # noqa: BLE001
+            return None
+        finally:
+            ws.CloseServiceHandle(handle)
+
+    def _refresh_start_types(
+        self, names: frozenset[str], states: dict[str, int]
+    ) -> None:
+        present = sorted(n for n in names if n in states)
+        stale = {
+            n for n in present
+            if n not in self._start_type or self._last_state.get(n) != states[n]
+        }
+        if present and self.config_refresh_batch:
+            start = self._refresh_cursor % len(present)
+            batch = itertools.islice(
+                itertools.cycle(present), start, start + self.config_refresh_batch
+            )
+            stale.update(batch)
+            self._refresh_cursor = start + self.config_refresh_batch
+        for name in stale:
+            start_type = self._query_start_type(name)
+            if start_type is None:
+                self._start_type.pop(name, None)
+            else:
+                self._start_type[name] = start_type
+        self._last_state = {n: states[n] for n in present}
+
+    def query_services(self, names: frozenset[str]) -> dict[str, ServiceInfo]:
+        ws = self._win32service
+        entries = ws.EnumServicesStatusEx(
+            self._scm, ws.SERVICE_WIN32, ws.SERVICE_STATE_ALL, None
+        )
+        states = {
+            e["ServiceName"]: e["CurrentState"]
+            for e in entries
+            if e["ServiceName"] in names
+        }
+        self._refresh_start_types(names, states)
+
+        result: dict[str, ServiceInfo] = {}
+        for name in names:
+            state = states.get(name)
+            if state is None:
+                result[name] = MISSING_SERVICE
+                continue
+            start_type = self._start_type.get(name)
+            result[name] = ServiceInfo(
+                exists=True,
+                running=state == ws.SERVICE_RUNNING,
+                enabled=start_type != ws.SERVICE_DISABLED,
+                state_text=self._states.get(state, "unknown"),
+                start_type_text=self._start_types.get(start_type, "unknown"),  # pyright: ignore[reportArgumentType]
+            )
+        return result
+
+    def query_tasks(self, names: frozenset[str]) -> dict[str, bool]:
+        from super_ctf.persistency.task import get_session  # noqa: PLC0415
+
+        task_enum_hidden = 1
+        tasks = get_session().call(
+            lambda root_folder: root_folder.GetTasks(task_enum_hidden)
+        )
+        found = {t.Name: bool(t.Enabled) for t in tasks if t.Name in names}
+        return {name: found.get(name, False) for name in names}
+
+
+def check_watch_many(
+    service_names: Iterable[str],
+    task_names: Iterable[str],
+    backend: BatchBackend | None = None,
+) -> Generator[MultiStatus]:
+    """Yield a `MultiStatus` for every watched service and task per cycle.
+
+    `backend` defaults to a new batch backend of `get_backend()`. Like
+    `check_watch`, the generator is infinite, does no sleeping and lets
+    backend exceptions propagate.
+    """
+    services = frozenset(service_names)
+    tasks = frozenset(task_names)
+    if backend is None:
+        backend = get_backend().batch()
+
+    while True:
+        yield MultiStatus(
+            services=backend.query_services(services) if services else {},
+            tasks=backend.query_tasks(tasks) if tasks else {},
+        )
+
+
+__all__ = [
+    "BatchBackend",
+    "MultiStatus",
+    "Win32BatchBackend",
+    "check_watch_many",
+]
+
@@ -1,23 +1,43 @@
 """Watcher utilities for checking service and scheduled task health.
 
-Provides a generator `check_watch` that repeatedly checks the TestService
-and a scheduled task and yields a status mapping on each iteration.
+Provides a generator `check_watch` that repeatedly checks the CTF service
+and a scheduled task and yields a status mapping on each iteration. The two
+probes come from the persistency backend and run concurrently on a
+`ProbePool` (see `super_ctf.probes`).
 
 The generator is cooperative: it yields control back to the caller with the
 latest status and then continues after the caller resumes iteration. This
 lets callers integrate the watcher into GUI loops or asyncio adapters easily
-without imposing its own sleep strategy.
+without imposing its own sleep strategy. Event loops that should not block
+a thread on `ProbePool.collect()` use `default_probe_batch()` instead.
+
+`watch_changes` is an event-driven alternative: it blocks on change
+notifications (see `super_ctf.notify`) and yields a `Status` only when the
+snapshot differs from the previous one, falling back to adaptive polling when
+notifications are unavailable. `watch_statuses` paces the probes the same way
+but yields every snapshot.
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, NamedTuple
+import functools
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Callable, Generator, Iterable
+    from concurrent.futures import Executor
+
+    from super_ctf.notify import NotificationSource
+    from super_ctf.pacing import Clock, PollPolicy
+
+from super_ctf.notify import open_notification_source
+from super_ctf.pacing import paced
+from super_ctf.persistency.backend import SERVICE_NAME, ServiceInfo, get_backend
+from super_ctf.persistency.task import TASK_NAME, close_session
+from super_ctf.probes import PROBE_TIMEOUT, ProbeBatch, ProbePool, com_uninitialize
 
-from super_ctf.persistency.service import TestService
-from super_ctf.persistency.task import TASK_NAME, check_task_status
+# Safety re-probe while notifications are active, in case one was missed.
+RESYNC_INTERVAL = 30.0
 
 
 class Status(NamedTuple):
@@ -28,18 +48,97 @@ class Status(NamedTuple):
     service_start_type: str
     task_enabled: bool
 
+    @classmethod
+    def from_probes(cls, svc_info: ServiceInfo, task_ok: bool) -> Status:
+        return cls(
+            service_exists=bool(svc_info.exists),
+            service_running=bool(svc_info.running),
+            service_enabled=bool(svc_info.enabled),
+            service_state_text=svc_info.state_text,
+            service_start_type=svc_info.start_type_text,
+            task_enabled=bool(task_ok),
+        )
+
+
+# Reported by a probe that has not answered yet (e.g. a Task Scheduler
+# hanging at startup). They match the state before any mission is done, so
+# a slow probe never counts as a completed mission.
+UNKNOWN_SERVICE = ServiceInfo(
+    exists=True,
+    running=True,
+    enabled=True,
+    state_text="unknown",
+    start_type_text="unknown",
+)
+UNKNOWN_TASK_ENABLED = True
+UNKNOWN_PROBES = {"service": UNKNOWN_SERVICE, "task": UNKNOWN_TASK_ENABLED}
+
+
+def _release_worker_thread() -> None:
+    close_session()
+    com_uninitialize()
+
+
+def default_probes(task_name: str = TASK_NAME) -> dict[str, Callable[[], Any]]:
+    """Return the service and scheduled task probes of the active backend."""
+    backend = get_backend()
+    return {
+        "service": backend.service.get_service_info,
+        "task": functools.partial(backend.tasks.check_task_status, task_name),
+    }
+
+
+def default_probe_pool(
+    task_name: str = TASK_NAME, timeout: float = PROBE_TIMEOUT
+) -> ProbePool:
+    """Return a pool running the service and scheduled task probes.
+
+    The probes come from the active persistency backend (`get_backend()`).
+    """
+    return ProbePool(
+        default_probes(task_name),
+        timeout=timeout,
+        thread_exit=_release_worker_thread,
+        unknown=UNKNOWN_PROBES,
+    )
+
+
+def default_probe_batch(
+    task_name: str = TASK_NAME,
+    timeout: float = PROBE_TIMEOUT,
+    executor: Executor | None = None,
+) -> ProbeBatch:
+    """Return the probes of `default_probe_pool` as a `ProbeBatch`, for event
+    loops: they run on `executor` (default: `probes.shared_executor()`).
+    """
+    return ProbeBatch(
+        default_probes(task_name),
+        timeout=timeout,
+        executor=executor,
+        unknown=UNKNOWN_PROBES,
+    )
+
 
-def check_watch(task_name: str = TASK_NAME) -> Generator[Status]:
+def check_watch(
+    task_name: str = TASK_NAME, pool: ProbePool | None = None
+) -> Generator[Status]:
     """Generator that continuously checks the liveness and configuration of a service
     and a scheduled task.
     This generator polls two sources of truth each iteration:
-    - TestService.get_service_info() to obtain current service state and metadata.
+    - the backend's get_service_info() (TestService on Windows) to obtain current
+        service state and metadata.
     - check_task_status(task_name) to determine whether the scheduled task is
         present and enabled.
     Parameters
     ----------
     task_name : str
             Name of the scheduled task to check. Defaults to the module-level TASK_NAME.
+    pool : ProbePool | None
+            Pool providing the "service" and "task" probes. Defaults to
+            `default_probe_pool(task_name)`, which is closed when the generator
+            is closed. Both probes run in parallel; a probe slower than the
+            pool timeout contributes its last result, or `UNKNOWN_SERVICE` /
+            `UNKNOWN_TASK_ENABLED` before it first answers.
     Yields
     ------
     Status
@@ -52,7 +151,7 @@ def check_watch(task_name: str = TASK_NAME) -> Generator[Status]:
                 - service_state_text (str): Human-readable state reported by the service
                     provider (e.g. "running", "stopped", "paused").
                 - service_start_type (str): Start type description (e.g. "auto", "manual",
-                    "disabled") as reported by TestService.
+                    "disabled") as reported by the backend.
                 - task_enabled (bool): True if the named scheduled task appears to be
                     present and enabled.
     Behavior
@@ -62,9 +161,11 @@ def check_watch(task_name: str = TASK_NAME) -> Generator[Status]:
     - This generator does not perform any sleeping or timing; the caller controls
         pacing between iterations (suitable for integration in GUI callbacks,
         schedulers, or event loops).
-    - No internal exception handling is performed: if TestService.get_service_info()
+    - No internal exception handling is performed: if the service probe
         or check_task_status() raises an exception, that exception will propagate to
         the caller.
+    - Each probe runs on its own worker thread with COM initialised, so the
+        caller does not need to call CoInitialize itself.
     Notes
     -----
     The exact structure and type name of the yielded object is "Status" as used by
@@ -72,18 +173,99 @@ def check_watch(task_name: str = TASK_NAME) -> Generator[Status]:
     for attribute access.
     """
 
-    while True:
-        svc_info = TestService.get_service_info()
-        task_ok: bool = check_task_status(task_name)
+    owns_pool = pool is None
+    if pool is None:
+        pool = default_probe_pool(task_name)
 
-        yield Status(
-            service_exists=bool(svc_info.exists),
-            service_running=bool(svc_info.running),
-            service_enabled=bool(svc_info.enabled),
-            service_state_text=svc_info.state_text,
-            service_start_type=svc_info.start_type_text,
-            task_enabled=bool(task_ok),
+    try:
+        while True:
+            results = pool.collect()
+            yield Status.from_probes(results["service"], results["task"])
+    finally:
+        if owns_pool:
+            pool.close()
+
+
+def watch_changes(
+    task_name: str = TASK_NAME,
+    source: NotificationSource | None = None,
+    pool: ProbePool | None = None,
+    policy: PollPolicy | None = None,
+    clock: Clock | None = None,
+) -> Generator[Status]:
+    """Yield a `Status` whenever the watched state changes.
+
+    The first snapshot is always yielded; see `watch_statuses` for the
+    arguments and the pacing.
+    """
+    yield from _changes(watch_statuses(task_name, source, pool, policy, clock))
+
+
+def watch_statuses(
+    task_name: str = TASK_NAME,
+    source: NotificationSource | None = None,
+    pool: ProbePool | None = None,
+    policy: PollPolicy | None = None,
+    clock: Clock | None = None,
+) -> Generator[Status]:
+    """Yield every probed `Status`, changed or not.
+
+    For consumers that diff snapshots themselves (`super_ctf.diff.deltas`).
+    Between probes the generator blocks
+    on `source` (by default the Win32 change notifications for TestService
+    and the Task Scheduler) for up to `RESYNC_INTERVAL` seconds. When no
+    source is available it polls instead, with `paced()` (see
+    `super_ctf.pacing`) applying `policy` and `clock`.
+
+    Unlike `check_watch`, this generator sleeps internally; run it on a
+    worker thread. Notification sources are bound to the thread that created
+    them, so the default source is opened on first iteration.
+    """
+    owns_source = source is None
+    backend = get_backend()
+    if source is None and backend.name == "win32":
+        # a Services key change or pending deletion may leave the probe's
+        # cached service handle stale
+        source = open_notification_source(
+            SERVICE_NAME, on_service_change=backend.service.invalidate
         )
 
+    statuses = check_watch(task_name, pool)
+    try:
+        if source is None:
+            yield from paced(statuses, policy, clock)
+        else:
+            yield from _notified(statuses, source)
+    finally:
+        statuses.close()
+        if owns_source and source is not None:
+            source.close()
+
+
+def _notified(
+    statuses: Iterable[Status], source: NotificationSource
+) -> Generator[Status]:
+    """Pull the next snapshot once `source` reports a change (or on resync)."""
+    for status in statuses:
+        yield status
+        source.wait(RESYNC_INTERVAL)
+
+
+def _changes(statuses: Iterable[Status]) -> Generator[Status]:
+    last: Status | None = None
+    for status in statuses:
+        if status != last:
+            last = status
+            yield status
+
 
-__all__ = ["check_watch"]
+__all__ = [
+    "UNKNOWN_PROBES",
+    "Status",
+    "check_watch",
+    "default_probe_batch",
+    "default_probe_pool",
+    "default_probes",
+    "watch_changes",
+    "watch_statuses",
+]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import pytest
+
+from super_ctf.persistency import task
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+RPC_E_DISCONNECTED = 0x80010108 - (1 << 32)  # as pywintypes reports it, signed
+ERROR_FILE_NOT_FOUND = 0x80070002 - (1 << 32)
+SCHED_E_SERVICE_NOT_RUNNING = 0x80041315 - (1 << 32)
+
+
+class FakeComError(Exception):
+    def __init__(self, hresult: int) -> None:
+        super().__init__(hresult, "fake COM error", None, None)
+        self.hresult = hresult
+
+
+class IntArgsComError(Exception):
+    """Like `pywintypes.com_error`: the HRESULT is only in `args[0]`."""
+
+    def __init__(self, hresult: int) -> None:
+        super().__init__(hresult, "fake COM error", None, None)
+
+
+class FakeScheduler:
+    """Stands in for `Schedule.Service`; all instances share `server`."""
+
+    def __init__(self, server: FakeServer) -> None:
+        self.server = server
+        self.generation = -1
+
+    def Connect(self) -> None:
+        self.server.connects += 1
+        self.generation = self.server.generation
+
+    def GetFolder(self, _path: str) -> FakeFolder:
+        return FakeFolder(self)
+
+    def NewTask(self, _flags: int) -> SimpleNamespace:
+        def collection() -> SimpleNamespace:
+            return SimpleNamespace(Create=lambda _kind: SimpleNamespace())
+
+        return SimpleNamespace(
+            scheduler=self,
+            RegistrationInfo=SimpleNamespace(),
+            Settings=SimpleNamespace(),
+            Triggers=collection(),
+            Actions=collection(),
+        )
+
+
+class FakeFolder:
+    def __init__(self, scheduler: FakeScheduler) -> None:
+        self.scheduler = scheduler
+
+    def GetTask(self, name: str) -> SimpleNamespace:
+        server = self.scheduler.server
+        server.calls += 1
+        if self.scheduler.generation != server.generation:
+            raise FakeComError(RPC_E_DISCONNECTED)
+        if name not in server.tasks:
+            raise FakeComError(ERROR_FILE_NOT_FOUND)
+        return SimpleNamespace(Enabled=server.tasks[name])
+
+    def RegisterTaskDefinition(
+        self, name: str, task_def: SimpleNamespace, *_args: object
+    ) -> None:
+        server = self.scheduler.server
+        server.calls += 1
+        if server.drop_on_register:
+            server.drop_on_register = False
+            server.generation += 1
+        if self.scheduler.generation != server.generation:
+            raise FakeComError(RPC_E_DISCONNECTED)
+        # a definition made by a dropped connection is unusable
+        if task_def.scheduler.generation != server.generation:
+            raise FakeComError(RPC_E_DISCONNECTED)
+        server.tasks[name] = True
+
+
+class FakeServer:
+    def __init__(self, tasks: dict[str, bool]) -> None:
+        self.tasks = tasks
+        self.connects = 0
+        self.calls = 0
+        # bumped to drop every existing connection
+        self.generation = 0
+        # drop every connection on the next RegisterTaskDefinition call
+        self.drop_on_register = False
+
+    def factory(self) -> FakeScheduler:
+        return FakeScheduler(self)
+
+
+@pytest.fixture
+def server() -> Iterator[FakeServer]:
+    server = FakeServer({"enabled": True, "disabled": False})
+    task.set_scheduler_factory(server.factory)
+    task.close_session()
+    yield server
+    task.close_session()
+    task.set_scheduler_factory()
+
+
+def test_connection_is_reused(server: FakeServer) -> None:
+    for _ in range(5):
+        assert task.check_task_status("enabled") is True
+    assert task.check_task_status("disabled") is False
+    assert server.connects == 1
+    assert server.calls == 6
+
+
+def test_missing_task_does_not_reconnect(server: FakeServer) -> None:
+    assert task.check_task_status("missing") is False
+    assert task.check_task_status("enabled") is True
+    assert server.connects == 1
+
+
+def test_reconnects_after_disconnect(server: FakeServer) -> None:
+    assert task.check_task_status("enabled") is True
+    server.generation += 1
+    assert task.check_task_status("enabled") is True
+    assert server.connects == 2
+    # the failed call plus its retry
+    assert server.calls == 3
+    assert task.get_session().connects == 2
+
+
+def test_create_task_rebuilds_definition_after_disconnect(server: FakeServer) -> None:
+    task.get_session().root_folder()
+    server.drop_on_register = True
+    task.create_task("new", "run.exe")
+    assert server.tasks["new"] is True
+    assert server.connects == 2
+
+
+def test_is_disconnect() -> None:
+    assert task.is_disconnect(FakeComError(RPC_E_DISCONNECTED))
+    assert not task.is_disconnect(FakeComError(ERROR_FILE_NOT_FOUND))
+    assert not task.is_disconnect(ValueError("not COM"))
+
+
+def test_is_disconnect_int_args() -> None:
+    assert task.is_disconnect(IntArgsComError(SCHED_E_SERVICE_NOT_RUNNING))
+    assert task.is_disconnect(IntArgsComError(RPC_E_DISCONNECTED))
+    assert not task.is_disconnect(IntArgsComError(ERROR_FILE_NOT_FOUND))